@@ -1,22 +1,37 @@
-from typing import List
+import argparse
+import mmap
+import os
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
 
 
-def guess_number(target: int, s: List[int], m: str) -> str:
+def guess_number(target: int, s: Sequence[int], m: str, is_sorted: bool = False) -> str:
     """
     Поиск числа в списке с помощью линейного или бинарного перебора.
 
     Args:
         target (int): Число, которое нужно найти.
-        s (list[int]): Отсортированный список чисел, в котором ищем.
+        s (Sequence[int]): Список чисел, в котором ищем, или объект range.
         m (str): Метод перебора:
             - '1' — медленный (линейный поиск),
-            - '2' — быстрый (бинарный поиск).
+            - '2' — быстрый (бинарный поиск),
+            - '3' — интерполяционный поиск,
+            - '4' — экспоненциальный (галопирующий) поиск.
+        is_sorted (bool): Последовательность уже отсортирована. Для range
+            и для is_sorted=True список не копируется и не сортируется,
+            а количество попыток вычисляется без перебора.
 
     Returns:
         str: Сообщение с результатом:
             - если число найдено → "Угадываемое число: X, количество попыток: N",
             - если число не найдено → "Число не найдено".
     """
+    if isinstance(s, range) or is_sorted:
+        return guess_sorted(target, s, m)
+
     if m == '1':  # Линейный перебор
         k: int = 0
         s.sort()
@@ -26,6 +41,10 @@ def guess_number(target: int, s: List[int], m: str) -> str:
                 return f'Угадываемое число: {target}, количество попыток: {k}'
         return 'Число не найдено'
 
+    elif m in ('3', '4'):  # Интерполяционный или экспоненциальный поиск
+        s.sort()
+        return guess_sorted(target, s, m)
+
     else:  # Бинарный перебор
         k: int = 0
         s.sort()
@@ -43,47 +62,549 @@ def guess_number(target: int, s: List[int], m: str) -> str:
         return 'Число не найдено'
 
 
-m: str = ''
-while m not in ['1', '2']:
-    m = input('Введите 1 для использования медленного перебора или 2 для использования бинарного перебора: ')
-    if m not in ['1', '2']:
-        print('Введите только 1 или 2')
+def equal_span(target: int, s: Sequence[int]) -> Tuple[int, int]:
+    """
+    Границы отрезка [lo, hi) позиций, где в отсортированной
+    последовательности стоит target (lo == hi, если числа нет).
 
-valid_target: bool = False
-target: int
-while not valid_target:
-    target_str: str = input('Введите угадываемое число: ')
-    try:
-        target = int(target_str)
-        if isinstance(target, int):
-            valid_target = True
-    except ValueError:
-        print('Введите целочисленное значение')
+    Для range вычисляется за O(1), для остальных — двоичным поиском.
+    """
+    if isinstance(s, range):
+        if target in s:
+            position: int = s.index(target)
+            return position, position + 1
+        return 0, 0
+    lo: int = bisect_left(s, target)
+    return lo, bisect_right(s, target, lo)
+
+
+def binary_attempts(n: int, lo: int, hi: int) -> int:
+    """
+    Число попыток бинарного перебора из guess_number для последовательности
+    длины n, если искомое число занимает позиции [lo, hi).
+
+    Сравниваются только индексы, к самой последовательности обращений нет.
+    """
+    k: int = 0
+    low: int = 0
+    high: int = n - 1
+    while low <= high:
+        k += 1
+        mid: int = (low + high) // 2
+        if lo <= mid < hi:
+            return k
+        elif mid < lo:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return k
+
+
+def binary_search(target: int, s: Sequence[int]) -> Tuple[bool, int]:
+    """
+    Бинарный перебор из guess_number без сортировки: s уже отсортирована.
+
+    Returns:
+        tuple[bool, int]: Найдено ли число и количество попыток.
+    """
+    k: int = 0
+    low: int = 0
+    high: int = len(s) - 1
+    while low <= high:
+        k += 1
+        mid: int = (low + high) // 2
+        value: int = s[mid]  # одно обращение к s на попытку
+        if value == target:
+            return True, k
+        elif value < target:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return False, k
+
+
+def interpolation_search(target: int, s: Sequence[int]) -> Tuple[bool, int]:
+    """
+    Интерполяционный поиск в отсортированной последовательности.
+
+    Позиция пробы оценивается по значениям на концах отрезка, поэтому на
+    равномерно распределённых данных нужно O(log log n) попыток.
+    Попытка — одно сравнение s[mid] с target, как в бинарном переборе.
+
+    Returns:
+        tuple[bool, int]: Найдено ли число и количество попыток.
+    """
+    k: int = 0
+    low: int = 0
+    high: int = len(s) - 1
+    while low <= high and s[low] <= target <= s[high]:
+        k += 1
+        if s[high] == s[low]:
+            mid: int = low
+        else:
+            mid = low + (target - s[low]) * (high - low) // (s[high] - s[low])
+        if s[mid] == target:
+            return True, k
+        elif s[mid] < target:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return False, k
+
+
+def exponential_search(target: int, s: Sequence[int]) -> Tuple[bool, int]:
+    """
+    Экспоненциальный (галопирующий) поиск в отсортированной последовательности.
+
+    Проверяются позиции 0, 1, 2, 4, 8, … до первой, где значение не меньше
+    target, затем бинарный перебор внутри найденного отрезка. Для числа на
+    позиции d нужно O(log d) попыток независимо от длины последовательности.
+
+    Returns:
+        tuple[bool, int]: Найдено ли число и количество попыток.
+    """
+    n: int = len(s)
+    if n == 0:
+        return False, 0
+    k: int = 1
+    if s[0] == target:
+        return True, k
+    bound: int = 1
+    if s[0] < target:
+        while bound < n:
+            k += 1
+            if s[bound] == target:
+                return True, k
+            if s[bound] > target:
+                break
+            bound *= 2
+    else:
+        return False, k
+    low: int = bound // 2 + 1
+    high: int = min(bound, n) - 1
+    while low <= high:
+        k += 1
+        mid: int = (low + high) // 2
+        if s[mid] == target:
+            return True, k
+        elif s[mid] < target:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return False, k
+
+
+def count_attempts(target: int, s: Sequence[int], m: str) -> Tuple[bool, int]:
+    """
+    Найдено ли число и сколько попыток сделал бы метод m на отсортированной
+    последовательности s (для ненайденного числа — попытки до отказа).
+    """
+    if m == '3':
+        return interpolation_search(target, s)
+    if m == '4':
+        return exponential_search(target, s)
+    if m != '1' and not isinstance(s, range):
+        return binary_search(target, s)  # обращения к s — ровно пробы перебора
+    lo, hi = equal_span(target, s)
+    if m == '1':
+        return lo < hi, lo + 1 if lo < hi else len(s)
+    return lo < hi, binary_attempts(len(s), lo, hi)
+
+
+def guess_sorted(target: int, s: Sequence[int], m: str) -> str:
+    """
+    Вариант guess_number для range или уже отсортированной
+    последовательности с __getitem__: без копирования, сортировки
+    и с памятью O(1). Сообщения и количество попыток — как в guess_number.
+    """
+    if isinstance(s, range) and s.step < 0:
+        s = s[::-1]  # тот же range по возрастанию, без копирования
+    found, k = count_attempts(target, s, m)
+    if not found:
+        return 'Число не найдено'
+    return f'Угадываемое число: {target}, количество попыток: {k}'
+
+
+class SortedInt64File:
+    """
+    Отсортированный двоичный файл int64 (little-endian) как последовательность.
+
+    Файл отображается в память через mmap и читается через memoryview.cast('q'),
+    в список он не загружается. Объект можно передавать в guess_number
+    с is_sorted=True, count_attempts и другие функции поиска.
+
+    cache_levels > 0 включает кеш верхних уровней бинарного перебора:
+    значения на позициях первых cache_levels проб (2 ** cache_levels - 1
+    чисел) читаются один раз при открытии, и повторные поиски не
+    обращаются к этим страницам файла. Счётчики hits/misses показывают,
+    сколько чтений обслужил кеш и сколько ушло в файл.
+    """
+
+    def __init__(self, path: str, cache_levels: int = 0) -> None:
+        self._file = open(path, 'rb')
+        size: int = os.fstat(self._file.fileno()).st_size
+        if size % 8:
+            self._file.close()
+            raise ValueError(f'Размер файла {path} не кратен 8 байтам')
+        self._mmap: Optional[mmap.mmap] = None
+        if size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap).cast('q')
+        else:  # пустой файл нельзя отобразить в память
+            self._view = memoryview(b'').cast('q')
+        self._swap: bool = sys.byteorder != 'little'
+        self._cache: Dict[int, int] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        if cache_levels > 0:
+            self._fill_cache(cache_levels)
+
+    def _read(self, i: int) -> int:
+        value: int = self._view[i]
+        if self._swap:
+            value = int.from_bytes(value.to_bytes(8, 'big', signed=True), 'little', signed=True)
+        return value
+
+    def _fill_cache(self, levels: int) -> None:
+        stack: List[Tuple[int, int, int]] = [(0, len(self._view) - 1, 1)]
+        while stack:
+            low, high, level = stack.pop()
+            if low > high or level > levels:
+                continue
+            mid: int = (low + high) // 2
+            self._cache[mid] = self._read(mid)
+            stack.append((low, mid - 1, level + 1))
+            stack.append((mid + 1, high, level + 1))
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __getitem__(self, i: int) -> int:
+        if i < 0:
+            i += len(self._view)
+        value: Optional[int] = self._cache.get(i)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        return self._read(i)
+
+    def close(self) -> None:
+        """Освобождает memoryview, mmap и файл."""
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'SortedInt64File':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def guess_in_file(target: int, path: str, m: str = '2', cache_levels: int = 0) -> str:
+    """
+    Вариант guess_number для отсортированного файла int64 без загрузки в память.
+
+    Для серии поисков выгоднее один раз открыть SortedInt64File и вызывать
+    guess_number(target, file, m, is_sorted=True) — тогда кеш верхних
+    уровней используется повторно.
+    """
+    with SortedInt64File(path, cache_levels) as s:
+        return guess_number(target, s, m, is_sorted=True)
 
-valid_start: bool = False
-start: int
-while not valid_start:
-    start_str: str = input('Введите первое число диапазона: ')
-    try:
-        start = int(start_str)
-        if isinstance(start, int):
-            valid_start = True
-    except ValueError:
-        print('Введите целочисленное значение')
 
-valid_end: bool = False
-end: int
-while not valid_end:
-    end_str: str = input('Введите второе число диапазона: ')
+def attempt_distribution(start: int, end: int, m: str, bins: int = 0) -> Dict[str, object]:
+    """
+    Точное распределение количества попыток по всем числам диапазона
+    [start, end] без запуска поиска для каждого числа.
+
+    Линейный перебор находит k-е число за k попыток. Для бинарного
+    число попыток равно глубине числа в дереве проб; по уровням хранятся
+    только размеры отрезков (на каждом уровне их не больше двух), поэтому
+    расчёт занимает O(log n).
+
+    Гистограмма для любого метода — список отрезков (first, last, count):
+    каждое число попыток от first до last нужно ровно count числам.
+    Для линейного перебора это один отрезок (1, n, 1), для бинарного —
+    по отрезку (k, k, count) на уровень, так что размер ответа не зависит
+    от длины диапазона.
+
+    Args:
+        start (int): Первое число диапазона.
+        end (int): Последнее число диапазона.
+        m (str): Метод перебора: '1' — линейный, иначе бинарный.
+        bins (int): Если больше 0, дополнительно считается список количеств
+            чисел в bins равных интервалах попыток от min до max.
+
+    Returns:
+        dict: Ключи 'count', 'min', 'max', 'mean', 'histogram' (список
+        отрезков) и 'bins' (список количеств, пустой при bins = 0).
+    """
+    n: int = max(0, end - start + 1)
+    if n == 0:
+        return {'count': 0, 'min': 0, 'max': 0, 'mean': 0.0, 'histogram': [], 'bins': [0] * bins}
+
+    histogram: List[Tuple[int, int, int]] = []
+    if m == '1':
+        high: int = n
+        total: int = n * (n + 1) // 2
+        histogram.append((1, n, 1))
+    else:
+        sizes: Dict[int, int] = {n: 1}
+        high = 0
+        total = 0
+        while sizes:
+            high += 1
+            level: int = sum(sizes.values())
+            histogram.append((high, high, level))
+            total += high * level
+            children: Dict[int, int] = {}
+            for size, count in sizes.items():
+                for part in ((size - 1) // 2, size // 2):  # слева и справа от mid
+                    if part:
+                        children[part] = children.get(part, 0) + count
+            sizes = children
+
+    buckets: List[int] = [0] * bins
+    if bins and m == '1':
+        # попытка k попадает в интервал (k - 1) * bins // n
+        edges: List[int] = [-(-b * n // bins) for b in range(bins + 1)]
+        buckets = [edges[b + 1] - edges[b] for b in range(bins)]
+    elif bins:
+        for k, _, count in histogram:
+            buckets[(k - 1) * bins // high] += count
+    return {'count': n, 'min': 1, 'max': high, 'mean': total / n, 'histogram': histogram, 'bins': buckets}
+
+
+# Распределения данных для сравнения методов: (генератор, размер) -> список
+DISTRIBUTIONS: Dict[str, Callable[[random.Random, int], List[int]]] = {
+    'range': lambda rng, n: list(range(1, n + 1)),
+    'uniform': lambda rng, n: [rng.randint(0, 100 * n) for _ in range(n)],
+    'exponential': lambda rng, n: [int(rng.expovariate(1 / n)) for _ in range(n)],
+    'clustered': lambda rng, n: [rng.randint(0, n) if rng.random() < 0.9 else rng.randint(0, 1000 * n)
+                                 for _ in range(n)],
+}
+
+
+def compare_modes(n: int = 10000, trials: int = 1000, modes: Sequence[str] = ('1', '2', '3', '4'),
+                  distributions: Optional[Dict[str, Callable[[random.Random, int], List[int]]]] = None,
+                  seed: int = 42) -> Dict[str, Dict[str, float]]:
+    """
+    Среднее количество попыток каждого метода на разных распределениях.
+
+    Args:
+        n (int): Размер последовательности.
+        trials (int): Количество искомых чисел (берутся из самих данных).
+        modes (Sequence[str]): Сравниваемые методы.
+        distributions (dict): Имя -> функция (random.Random, n) -> список;
+            по умолчанию DISTRIBUTIONS.
+        seed (int): Начальное значение генератора случайных чисел.
+
+    Returns:
+        dict: {распределение: {метод: среднее количество попыток}}.
+    """
+    rng = random.Random(seed)
+    report: Dict[str, Dict[str, float]] = {}
+    for name, make in (distributions or DISTRIBUTIONS).items():
+        s: List[int] = sorted(make(rng, n))
+        targets: List[int] = [rng.choice(s) for _ in range(trials)]
+        report[name] = {m: sum(count_attempts(x, s, m)[1] for x in targets) / trials for m in modes}
+    return report
+
+
+def print_comparison(report: Dict[str, Dict[str, float]]) -> None:
+    """Выводит результат compare_modes таблицей."""
+    modes: List[str] = list(next(iter(report.values()), {}))
+    print('Распределение'.ljust(14) + ''.join(f'Метод {m}'.rjust(12) for m in modes))
+    for name, row in report.items():
+        print(name.ljust(14) + ''.join(f'{row[m]:12.2f}' for m in modes))
+
+
+def guess_batch(targets: Sequence[int], s: Sequence[int], m: str, is_sorted: bool = False):
+    """
+    Пакетный вариант guess_number на NumPy для массива искомых чисел.
+
+    Последовательность сортируется один раз (или не сортируется при
+    is_sorted=True / range), позиции находятся через searchsorted,
+    а попытки считаются векторно для всех чисел сразу.
+
+    Args:
+        targets (Sequence[int]): Искомые числа.
+        s (Sequence[int]): Список чисел, в котором ищем.
+        m (str): Метод перебора, как в guess_number ('1' или '2').
+        is_sorted (bool): Последовательность уже отсортирована.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: Признаки «найдено» и количество
+        попыток. Для ненайденных чисел — сколько попыток сделал бы перебор
+        до сообщения "Число не найдено".
+    """
+    import numpy as np
+
+    if isinstance(s, range):
+        if s.step < 0:
+            s = s[::-1]
+        values = np.arange(s.start, s.stop, s.step, dtype=np.int64)
+    else:
+        values = np.asarray(s)
+        if not is_sorted:
+            values = np.sort(values)
+    targets = np.asarray(targets)
+    lo = np.searchsorted(values, targets, 'left')
+    hi = np.searchsorted(values, targets, 'right')
+    found = hi > lo
+    n = len(values)
+
+    if m == '1':  # Линейный перебор: позиция первого вхождения + 1 или вся длина
+        return found, np.where(found, lo + 1, n).astype(np.int64)
+
+    # Бинарный перебор: тот же цикл low/high/mid по индексам для всех чисел
+    attempts = np.zeros(len(targets), dtype=np.int64)
+    low = np.zeros(len(targets), dtype=np.int64)
+    high = np.full(len(targets), n - 1, dtype=np.int64)
+    active = low <= high
+    while active.any():
+        attempts += active
+        mid = (low + high) // 2
+        hit = active & (lo <= mid) & (mid < hi)
+        go_right = active & ~hit & (mid < lo)
+        go_left = active & ~hit & ~go_right
+        low = np.where(go_right, mid + 1, low)
+        high = np.where(go_left, mid - 1, high)
+        active &= ~hit & (low <= high)
+    return found, attempts
+
+
+MODES: List[str] = ['1', '2', '3', '4']
+
+
+def interactive() -> None:
+    """Диалоговый режим: метод, число и диапазон вводятся с клавиатуры."""
+    m: str = ''
+    while m not in MODES:
+        m = input('Введите 1 для использования медленного перебора, 2 для бинарного, '
+                  '3 для интерполяционного или 4 для экспоненциального поиска: ')
+        if m not in MODES:
+            print('Введите только 1, 2, 3 или 4')
+
+    valid_target: bool = False
+    target: int
+    while not valid_target:
+        target_str: str = input('Введите угадываемое число: ')
+        try:
+            target = int(target_str)
+            if isinstance(target, int):
+                valid_target = True
+        except ValueError:
+            print('Введите целочисленное значение')
+
+    valid_start: bool = False
+    start: int
+    while not valid_start:
+        start_str: str = input('Введите первое число диапазона: ')
+        try:
+            start = int(start_str)
+            if isinstance(start, int):
+                valid_start = True
+        except ValueError:
+            print('Введите целочисленное значение')
+
+    valid_end: bool = False
+    end: int
+    while not valid_end:
+        end_str: str = input('Введите второе число диапазона: ')
+        try:
+            end = int(end_str)
+            if isinstance(end, int):
+                if start >= end:
+                    print('Первое число должно быть меньше второго')
+                else:
+                    valid_end = True
+        except ValueError:
+            print('Введите целочисленное значение')
+
+    s: range = range(start, end + 1)
+    print(guess_number(target, s, m))
+
+
+def parse_query(line: str) -> Tuple[str, int, int, int]:
+    """
+    Разбирает строку запроса "метод число начало конец".
+
+    Raises:
+        ValueError: С тем же сообщением, что и в диалоговом режиме.
+    """
+    parts: List[str] = line.replace(',', ' ').split()
+    if len(parts) != 4:
+        raise ValueError('Ожидается: метод число начало конец')
+    m: str = parts[0]
+    if m not in MODES:
+        raise ValueError('Введите только 1, 2, 3 или 4')
     try:
-        end = int(end_str)
-        if isinstance(end, int):
-            if start >= end:
-                print('Первое число должно быть меньше второго')
-            else:
-                valid_end = True
+        target, start, end = (int(x) for x in parts[1:])
     except ValueError:
-        print('Введите целочисленное значение')
+        raise ValueError('Введите целочисленное значение') from None
+    if start >= end:
+        raise ValueError('Первое число должно быть меньше второго')
+    return m, target, start, end
+
+
+def run_batch(lines: Iterable[str], out: TextIO) -> Dict[str, float]:
+    """
+    Пакетный режим без диалога: по одной строке результата на запрос.
+
+    Диапазон каждого запроса — range(start, end + 1): он создаётся за O(1)
+    и не хранится между запросами, поэтому память не растёт на бесконечном
+    потоке. Пустые строки и строки, начинающиеся с '#', пропускаются.
+
+    Args:
+        lines (Iterable[str]): Строки запросов (поток stdin, файл, список).
+        out (TextIO): Куда писать результаты.
+
+    Returns:
+        dict: Количество запросов, время работы (с) и запросов в секунду.
+    """
+    count: int = 0
+    started: float = time.perf_counter()
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        count += 1
+        try:
+            m, target, start, end = parse_query(line)
+        except ValueError as e:
+            out.write(f'{e}\n')
+            continue
+        out.write(guess_number(target, range(start, end + 1), m) + '\n')
+    seconds: float = time.perf_counter() - started
+    return {'queries': count, 'seconds': seconds, 'per_second': count / seconds if seconds else 0.0}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Запуск из командной строки.
+
+    Без аргументов — диалоговый режим. С ключом --batch запросы читаются
+    из файла (или из stdin, если файл не указан или равен '-'),
+    а производительность выводится в stderr.
+    """
+    parser = argparse.ArgumentParser(description='Угадывание числа линейным, бинарным и другими методами')
+    parser.add_argument('--batch', action='store_true', help='пакетный режим без диалога')
+    parser.add_argument('file', nargs='?', default='-', help='файл с запросами "метод число начало конец"')
+    args = parser.parse_args(argv)
+    if not args.batch:
+        interactive()
+        return
+    if args.file == '-':
+        stats = run_batch(sys.stdin, sys.stdout)
+    else:
+        with open(args.file, encoding='utf-8') as file:
+            stats = run_batch(file, sys.stdout)
+    print(f"Обработано запросов: {stats['queries']} за {stats['seconds']:.3f} с "
+          f"({stats['per_second']:.0f} запросов/с)", file=sys.stderr)
+
 
-s: List[int] = list(range(start, end + 1))
-print(guess_number(target, s, m))
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,22 @@
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pprint import pprint
-from typing import Callable, Dict, List
+from typing import IO, Callable, Dict, Iterator, List, MutableSequence, Optional, Sequence, Tuple, Union
 
 # Тип для дерева: ключ — str, значение — список поддеревьев
 Tree = Dict[str, List['Tree']]
 
+# Коэффициенты аффинной функции ветви: f(x) = a * x + b
+Affine = Tuple[int, int]
+
 
 def left_branch(root: int) -> int:
     """
@@ -46,6 +59,1308 @@ def gen_bin_tree(height: int = 6, root: int = 15,
     return {str(root): [left_b, right_b]}
 
 
+# Порядки обхода для iter_nodes и iter_tree
+TRAVERSAL_ORDERS = ('pre', 'in', 'post', 'bfs')
+
+# Узел при обходе: (глубина, путь от корня, значение)
+Visit = Tuple[int, Tuple[int, ...], int]
+
+
+def iter_nodes(levels: int, root: int = 15,
+               l_b: Callable[[int], int] = left_branch,
+               r_b: Callable[[int], int] = right_branch,
+               order: str = 'pre') -> Iterator[Visit]:
+    """
+    Обход дерева из levels уровней без рекурсии и без построения дерева.
+
+    Узлы выдаются по одному в виде (глубина, путь, значение), где путь —
+    кортеж шагов от корня (0 — влево, 1 — вправо, как в TreeView.index).
+    Потомки вычисляются только при раскрытии узла, поэтому обход можно
+    прервать в любой момент, а глубина не ограничена стеком вызовов.
+    При обходе в глубину элементы стека путей не хранят: путь — один
+    общий список, поэтому память — O(levels), а кортеж пути создаётся
+    при выдаче узла за O(глубины). Для 'bfs' очередь держит до двух
+    уровней узлов вместе с их путями: O(2 ** depth * depth).
+
+    levels: Количество уровней дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    order: 'pre', 'in', 'post' (в глубину) или 'bfs' (в ширину)
+    return: Итератор по узлам
+    """
+    if order not in TRAVERSAL_ORDERS:
+        raise ValueError(f'Неизвестный порядок обхода: {order}')
+    if levels <= 0:
+        return
+    last = levels - 1
+    if order == 'bfs':
+        queue = deque([(0, (), root)])
+        while queue:
+            depth, path, value = queue.popleft()
+            yield depth, path, value
+            if depth < last:
+                queue.append((depth + 1, path + (0,), l_b(value)))
+                queue.append((depth + 1, path + (1,), r_b(value)))
+        return
+    # Элемент стека: глубина, шаг от родителя, значение и признак того,
+    # что узел уже раскрыт и ждёт выдачи; path — путь текущего узла
+    path: List[int] = []
+    stack: List[Tuple[int, int, int, bool]] = [(0, 0, root, False)]
+    while stack:
+        depth, step, value, ready = stack.pop()
+        if ready:  # поддеревья пройдены, path[:depth] не менялся
+            del path[depth:]
+            yield depth, tuple(path), value
+            continue
+        if depth:
+            del path[depth - 1:]
+            path.append(step)
+        if depth == last:
+            yield depth, tuple(path), value
+            continue
+        left = (depth + 1, 0, l_b(value), False)
+        right = (depth + 1, 1, r_b(value), False)
+        if order == 'pre':
+            yield depth, tuple(path), value
+            stack.extend((right, left))
+        elif order == 'in':
+            stack.extend((right, (depth, step, value, True), left))
+        else:
+            stack.extend(((depth, step, value, True), right, left))
+
+
+def iter_tree(height: int = 6, root: int = 15,
+              l_b: Callable[[int], int] = left_branch,
+              r_b: Callable[[int], int] = right_branch,
+              order: str = 'pre') -> Iterator[Visit]:
+    """
+    Ленивый обход дерева gen_bin_tree (см. iter_nodes).
+
+    height: Высота дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    order: 'pre', 'in', 'post' или 'bfs'
+    return: Итератор по (глубина, путь, значение)
+    """
+    return iter_nodes(max(height, 0) + 1, root, l_b, r_b, order)
+
+
+class SubtreeCache:
+    """
+    Ограниченный LRU-кеш поддеревьев для gen_bin_tree_memo.
+
+    Поддерево зависит только от (height, root, l_b, r_b), поэтому
+    одинаковые поддеревья строятся один раз и используются повторно.
+    Счётчики hits и misses показывают, сколько раз кеш помог.
+    """
+
+    def __init__(self, maxsize: int = 100000) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[tuple, Tree]' = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[Tree]:
+        subtree = self._data.get(key)
+        if subtree is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return subtree
+
+    def put(self, key: tuple, subtree: Tree) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = subtree
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def gen_bin_tree_memo(height: int = 6, root: int = 15,
+                      l_b: Callable[[int], int] = left_branch,
+                      r_b: Callable[[int], int] = right_branch,
+                      cache: Optional[SubtreeCache] = None,
+                      share: bool = False) -> Tree:
+    """
+    gen_bin_tree с кешем поддеревьев: одинаковые поддеревья строятся один
+    раз, и дерево хранится как ориентированный ациклический граф. Например,
+    для ветвей x + 1 и x - 1 на уровне h всего h + 1 разных значений,
+    и граф высотой h занимает O(h ** 2) узлов вместо 2 ** h.
+
+    height: Высота дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    cache: Кеш поддеревьев (по умолчанию новый на один вызов)
+    share: True — вернуть граф с общими поддеревьями без копирования
+        (только для чтения!); False — обычное дерево из независимых словарей
+    return: Словарь, как у gen_bin_tree
+    """
+    if cache is None:
+        cache = SubtreeCache()
+    tree = _build_shared(height, root, l_b, r_b, cache)
+    return tree if share else copy_tree(tree)
+
+
+def _build_shared(height: int, root: int, l_b: Callable[[int], int],
+                  r_b: Callable[[int], int], cache: SubtreeCache) -> Tree:
+    key = (height, root, l_b, r_b)
+    subtree = cache.get(key)
+    if subtree is not None:
+        return subtree
+    if height <= 0:
+        subtree = {str(root): []}
+    else:
+        subtree = {str(root): [_build_shared(height - 1, l_b(root), l_b, r_b, cache),
+                               _build_shared(height - 1, r_b(root), l_b, r_b, cache)]}
+    cache.put(key, subtree)
+    return subtree
+
+
+def copy_tree(tree: Tree) -> Tree:
+    """
+    Копия дерева, в которой каждое поддерево — отдельный словарь
+    (в отличие от copy.deepcopy, общие поддеревья не сохраняются общими).
+    """
+    return {key: [copy_tree(child) for child in children] for key, children in tree.items()}
+
+
+class TreeGrower:
+    """
+    Наращивание готового дерева-словаря (из gen_bin_tree lab3 или lab5)
+    на k уровней без повторного построения.
+
+    Листья дерева находятся один раз при создании; после этого grow(k)
+    раскрывает только текущие листья и запоминает новые, так что каждый
+    вызов стоит столько, сколько узлов добавлено. Дерево меняется на месте.
+    """
+
+    def __init__(self, tree: Tree,
+                 l_b: Callable[[int], int] = left_branch,
+                 r_b: Callable[[int], int] = right_branch) -> None:
+        self.tree = tree
+        self.l_b = l_b
+        self.r_b = r_b
+        self.levels = 0
+        self._leaves: List[tuple] = []
+        level = [(key, children) for key, children in tree.items()]
+        while level:
+            self.levels += 1
+            if not any(children for _, children in level):
+                break
+            level = [item for _, children in level for child in children for item in child.items()]
+        self._leaves = [(int(key), children) for key, children in level]
+
+    def grow(self, k: int = 1) -> Tree:
+        """Добавляет k уровней и возвращает то же (изменённое) дерево."""
+        for _ in range(k):
+            leaves = []
+            for node, children in self._leaves:
+                for value in (self.l_b(node), self.r_b(node)):
+                    subtree = {str(value): []}
+                    children.append(subtree)
+                    leaves.append((value, subtree[str(value)]))
+            self._leaves = leaves
+            if leaves:
+                self.levels += 1
+        return self.tree
+
+
+class HeapLayout(ABC):
+    """
+    Навигация по бинарному дереву в неявной кучевой раскладке.
+
+    Узлы нумеруются по уровням слева направо: корень — 0, потомки узла i —
+    2i + 1 и 2i + 2, родитель — (i - 1) // 2. Дерево из levels уровней
+    содержит 2 ** levels - 1 узлов. Подклассы обязаны определить value(i).
+    """
+
+    levels: int = 0
+
+    @abstractmethod
+    def value(self, i: int) -> int:
+        """Значение узла i."""
+
+    def __len__(self) -> int:
+        return 2 ** self.levels - 1
+
+    @property
+    def height(self) -> int:
+        """Высота в смысле gen_bin_tree (число уровней минус один)."""
+        return self.levels - 1
+
+    def left(self, i: int) -> Optional[int]:
+        """Индекс левого потомка или None для листа."""
+        child = 2 * i + 1
+        return child if child < len(self) else None
+
+    def right(self, i: int) -> Optional[int]:
+        """Индекс правого потомка или None для листа."""
+        child = 2 * i + 2
+        return child if child < len(self) else None
+
+    def parent(self, i: int) -> Optional[int]:
+        """Индекс родителя или None для корня."""
+        return (i - 1) // 2 if i > 0 else None
+
+    def children(self, i: int) -> List[int]:
+        """Индексы потомков узла (пустой список для листа)."""
+        return [2 * i + 1, 2 * i + 2] if 2 * i + 1 < len(self) else []
+
+    @staticmethod
+    def level(i: int) -> int:
+        """Уровень узла (корень — уровень 0)."""
+        return (i + 1).bit_length() - 1
+
+    def to_dict(self, i: int = 0) -> Tree:
+        """
+        Поддерево узла i в формате gen_bin_tree: {str(значение): [левое, правое]}.
+        Для дерева без уровней возвращает пустой словарь.
+        """
+        if i >= len(self):
+            return {}
+        return {str(self.value(i)): [self.to_dict(c) for c in self.children(i)]}
+
+
+class HeapTree(HeapLayout):
+    """
+    Компактное дерево: значения узлов в одном массиве array('q') в кучевом
+    порядке (8 байт на узел вместо словаря, списка и строки). Если значения
+    не помещаются в int64, используется обычный список целых чисел.
+    Функции ветвей запоминаются, чтобы дерево можно было нарастить (extend).
+    """
+
+    def __init__(self, values: MutableSequence[int],
+                 l_b: Callable[[int], int] = left_branch,
+                 r_b: Callable[[int], int] = right_branch) -> None:
+        levels = len(values).bit_length()
+        if len(values) != 2 ** levels - 1:
+            raise ValueError('Число узлов должно быть равно 2 ** levels - 1')
+        self.values = values
+        self.levels = levels
+        self.l_b = l_b
+        self.r_b = r_b
+
+    def value(self, i: int) -> int:
+        """Значение узла i."""
+        return int(self.values[i])
+
+    def level_values(self, level: int) -> MutableSequence[int]:
+        """Значения всех узлов уровня level слева направо."""
+        return self.values[2 ** level - 1:2 ** (level + 1) - 1]
+
+    def extend(self, k: int = 1) -> 'HeapTree':
+        """
+        Добавляет k уровней, раскрывая только текущие листья: в кучевом
+        порядке новые узлы дописываются в конец массива, поэтому стоимость
+        пропорциональна числу новых узлов (для массива NumPy добавляется
+        одно копирование при склейке).
+        """
+        if k <= 0 or self.levels == 0:
+            return self
+        if not isinstance(self.values, (array, list)):  # массив NumPy
+            import numpy as np
+
+            level = self.level_values(self.levels - 1)
+            parts = [self.values]
+            for _ in range(k):
+                level = _next_level_numpy(level, self.l_b, self.r_b)
+                parts.append(level)
+            dtype = object if any(part.dtype == object for part in parts) else np.int64
+            self.values = np.concatenate([part.astype(dtype, copy=False) for part in parts])
+            self.levels += k
+            return self
+        values = self.values
+        start = 2 ** (self.levels - 1) - 1  # первый лист
+        for i in range(start, 2 ** (self.levels + k - 1) - 1):
+            node = values[i]
+            left_val, right_val = self.l_b(node), self.r_b(node)
+            try:
+                values.append(left_val)
+                values.append(right_val)
+            except OverflowError:  # значения вышли за int64 — дальше список
+                values = list(values[:2 * i + 1])
+                values.extend((left_val, right_val))
+        self.values = values
+        self.levels += k
+        return self
+
+
+def build_heap(levels: int, root: int,
+               l_b: Callable[[int], int] = left_branch,
+               r_b: Callable[[int], int] = right_branch) -> HeapTree:
+    """
+    Строит HeapTree из levels уровней (0 — пустое дерево).
+
+    levels: Количество уровней дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    return: Компактное дерево
+    """
+    values: MutableSequence[int] = array('q')
+    if levels <= 0:
+        return HeapTree(values, l_b, r_b)
+    try:
+        values.append(root)
+    except OverflowError:
+        values = [root]
+    return HeapTree(values, l_b, r_b).extend(levels - 1)
+
+
+def gen_bin_tree_compact(height: int = 6, root: int = 15,
+                         l_b: Callable[[int], int] = left_branch,
+                         r_b: Callable[[int], int] = right_branch) -> HeapTree:
+    """
+    То же дерево, что gen_bin_tree, в компактном виде HeapTree.
+
+    height: Высота дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    return: HeapTree; to_dict() даёт результат gen_bin_tree
+    """
+    return build_heap(max(height, 0) + 1, root, l_b, r_b)
+
+
+class TreeView(HeapLayout):
+    """
+    Ленивое дерево: узлы не строятся заранее, значение узла вычисляется
+    применением l_b и r_b только вдоль пути от корня (или от ближайшего
+    уже вычисленного предка). Вычисленные значения хранятся в LRU-кеше
+    на cache_size узлов, поэтому память пропорциональна числу
+    посещённых узлов, а не 2 ** levels. Навигация — как у HeapTree.
+    """
+
+    def __init__(self, levels: int, root: int,
+                 l_b: Callable[[int], int] = left_branch,
+                 r_b: Callable[[int], int] = right_branch,
+                 cache_size: int = 4096) -> None:
+        self.levels = max(levels, 0)
+        self.root = root
+        self.l_b = l_b
+        self.r_b = r_b
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[int, int]' = OrderedDict()
+
+    def value(self, i: int) -> int:
+        """Значение узла i (вычисляется при первом обращении)."""
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        path: List[int] = []
+        while i > 0 and i not in self._cache:
+            path.append(i)
+            i = (i - 1) // 2
+        if i == 0:
+            node = self.root
+        else:
+            node = self._cache[i]
+            self._cache.move_to_end(i)
+        for k in reversed(path):
+            node = self.l_b(node) if k % 2 else self.r_b(node)
+            self._remember(k, node)
+        return node
+
+    def _remember(self, i: int, node: int) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[i] = node
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def index(path: Sequence[int]) -> int:
+        """Индекс узла по пути от корня: 0 — влево, 1 — вправо."""
+        i = 0
+        for step in path:
+            i = 2 * i + 1 + step
+        return i
+
+    def cached(self) -> int:
+        """Сколько узлов сейчас хранится в кеше."""
+        return len(self._cache)
+
+
+def gen_bin_tree_lazy(height: int = 6, root: int = 15,
+                      l_b: Callable[[int], int] = left_branch,
+                      r_b: Callable[[int], int] = right_branch,
+                      cache_size: int = 4096) -> TreeView:
+    """
+    Ленивый вариант gen_bin_tree: узлы вычисляются по требованию.
+
+    height: Высота дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    cache_size: Сколько вычисленных узлов хранить
+    return: TreeView; to_dict() даёт результат gen_bin_tree
+    """
+    return TreeView(max(height, 0) + 1, root, l_b, r_b, cache_size)
+
+
+# Точки, в которых проверяется аффинность функции ветви
+AFFINE_PROBES = (0, 1, -1, 2, 3, -7, 1000, -123456, 2 ** 40 + 3)
+
+# Заведомо аффинные ветви модуля: для них формулы применяются без проверки
+KNOWN_AFFINE: Dict[Callable[[int], int], Affine] = {left_branch: (2, 2), right_branch: (2, -2)}
+
+
+def affine_coefficients(func: Callable[[int], int]) -> Optional[Affine]:
+    """
+    Определяет коэффициенты (a, b) функции ветви вида a * x + b по её
+    значениям в точках AFFINE_PROBES. Если функция не аффинна (или не
+    целочисленна) в этих точках, возвращает None. Совпадение в конечном
+    числе точек не доказывает аффинность, поэтому функции модуля
+    используют подбор только при detect=True.
+
+    func: Функция ветви
+    return: (a, b) или None
+    """
+    try:
+        b = func(0)
+        a = func(1) - b
+        if not isinstance(a, int) or not isinstance(b, int):
+            return None
+        if all(func(x) == a * x + b for x in AFFINE_PROBES):
+            return a, b
+    except Exception:
+        pass
+    return None
+
+
+def _resolve_affine(l_b: Callable[[int], int], r_b: Callable[[int], int],
+                    affine: Optional[Tuple[Affine, Affine]], detect: bool) -> Optional[Tuple[Affine, Affine]]:
+    if affine is not None:
+        return affine
+    if detect:
+        left, right = affine_coefficients(l_b), affine_coefficients(r_b)
+    else:
+        left, right = KNOWN_AFFINE.get(l_b), KNOWN_AFFINE.get(r_b)
+    return (left, right) if left and right else None
+
+
+def node_value(level: int, index: int, root: int = 15,
+               l_b: Callable[[int], int] = left_branch,
+               r_b: Callable[[int], int] = right_branch,
+               affine: Optional[Tuple[Affine, Affine]] = None,
+               detect: bool = False) -> int:
+    """
+    Значение узла с номером index (0 .. 2 ** level - 1 слева направо)
+    на уровне level без построения предков.
+
+    Если обе ветви аффинны с одинаковым множителем a (как left_branch
+    и right_branch: 2x + 2 и 2x - 2), значение равно
+    a ** level * root + b_l * (1 + a + ... + a ** (level - 1)) + (b_r - b_l) * D,
+    где D — биты index, прочитанные в системе счисления a; при a = 2
+    D = index и расчёт занимает O(1) операций с большими целыми.
+    Для разных множителей аффинные отображения композируются по битам
+    пути без вызова функций; для произвольных функций они применяются
+    вдоль пути от корня, как при построении дерева.
+
+    level: Уровень узла (корень — 0)
+    index: Номер узла на уровне; биты от старшего — путь (0 — влево)
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    affine: Коэффициенты ((a_l, b_l), (a_r, b_r)), если известны
+    detect: Подбирать коэффициенты произвольных ветвей по точкам
+        (affine_coefficients); без него формулы применяются только
+        к left_branch и right_branch (KNOWN_AFFINE)
+    return: Значение узла
+    """
+    if not 0 <= index < 2 ** level:
+        raise IndexError(index)
+    coefficients = _resolve_affine(l_b, r_b, affine, detect)
+    if coefficients is None:
+        node = root
+        for shift in range(level - 1, -1, -1):
+            node = r_b(node) if index >> shift & 1 else l_b(node)
+        return node
+    (a_l, b_l), (a_r, b_r) = coefficients
+    if a_l == a_r:
+        a = a_l
+        return a ** level * root + b_l * _geometric(a, level) + (b_r - b_l) * _digits(index, a, level)
+    node = root
+    for shift in range(level - 1, -1, -1):
+        node = a_r * node + b_r if index >> shift & 1 else a_l * node + b_l
+    return node
+
+
+def _affine(a: int, b: int) -> Callable[[int], int]:
+    """Функция x -> a * x + b."""
+    return lambda x: a * x + b
+
+
+def _geometric(a: int, level: int) -> int:
+    """1 + a + ... + a ** (level - 1)."""
+    return level if a == 1 else (a ** level - 1) // (a - 1)
+
+
+def _digits(index: int, a: int, level: int) -> int:
+    """Биты index (level штук) как цифры числа в системе счисления a."""
+    if a == 2:
+        return index
+    value = 0
+    for shift in range(level - 1, -1, -1):
+        value = value * a + (index >> shift & 1)
+    return value
+
+
+def level_values(level: int, root: int = 15,
+                 l_b: Callable[[int], int] = left_branch,
+                 r_b: Callable[[int], int] = right_branch,
+                 affine: Optional[Tuple[Affine, Affine]] = None,
+                 detect: bool = False) -> Sequence[int]:
+    """
+    Все значения уровня level слева направо без обхода верхних уровней.
+
+    Для аффинных ветвей с общим множителем 2 уровень — арифметическая
+    прогрессия и возвращается как range за O(1). При другом общем
+    множителе каждое значение получается из предыдущего за O(1)
+    (приращение D при увеличении номера). Иначе уровень строится
+    от корня, как в gen_bin_tree.
+
+    level: Уровень (корень — 0)
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    affine: Коэффициенты ((a_l, b_l), (a_r, b_r)), если известны
+    detect: Подбирать коэффициенты произвольных ветвей по точкам
+        (affine_coefficients); без него формулы применяются только
+        к left_branch и right_branch (KNOWN_AFFINE)
+    return: Последовательность из 2 ** level значений
+    """
+    coefficients = _resolve_affine(l_b, r_b, affine, detect)
+    width = 2 ** level
+    if coefficients is not None and coefficients[0][0] == coefficients[1][0]:
+        (a, b_l), (_, b_r) = coefficients
+        first = a ** level * root + b_l * _geometric(a, level)
+        step = b_r - b_l
+        if a == 2 and step:
+            return range(first, first + step * width, step)
+        powers = [a ** j for j in range(level + 1)]
+        sums = [0]
+        for power in powers:
+            sums.append(sums[-1] + power)
+        values = [first]
+        digits = 0
+        for k in range(width - 1):
+            ones = (k ^ (k + 1)).bit_length() - 1  # младшие единицы k
+            digits += powers[ones] - sums[ones]
+            values.append(first + step * digits)
+        return values
+    if coefficients is not None:
+        (a_l, b_l), (a_r, b_r) = coefficients
+        l_b, r_b = _affine(a_l, b_l), _affine(a_r, b_r)
+    values = [root]
+    for _ in range(level):
+        values = [child for node in values for child in (l_b(node), r_b(node))]
+    return values
+
+
+def _affine_level(level: int, root: int, coefficients: Optional[Tuple[Affine, Affine]]):
+    """
+    Уровень аффинного дерева с общим множителем |a| >= 2 в виде
+    (first, step, a): значения равны first + step * D, где D — биты
+    номера узла в системе счисления a. Для остальных случаев — None.
+    """
+    if coefficients is None:
+        return None
+    (a, b_l), (a_r, b_r) = coefficients
+    if a != a_r or abs(a) < 2 or b_l == b_r:
+        return None
+    return a ** level * root + b_l * _geometric(a, level), b_r - b_l, a
+
+
+def iter_level_stats(levels: int, root: int = 15,
+                     l_b: Callable[[int], int] = left_branch,
+                     r_b: Callable[[int], int] = right_branch,
+                     affine: Optional[Tuple[Affine, Affine]] = None,
+                     detect: bool = False) -> Iterator[Dict[str, int]]:
+    """
+    Статистика по уровням дерева без его построения: для каждого уровня
+    словарь с ключами level, count, sum, min, max.
+
+    Для аффинных ветвей с общим множителем (см. node_value) всё считается
+    по формулам за O(level). Иначе уровни строятся по одному из
+    предыдущего и отбрасываются после подсчёта: в памяти не больше
+    двух соседних уровней.
+
+    levels: Количество уровней
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    affine: Коэффициенты ((a_l, b_l), (a_r, b_r)), если известны
+    detect: Подбирать коэффициенты произвольных ветвей по точкам
+        (affine_coefficients); без него формулы применяются только
+        к left_branch и right_branch (KNOWN_AFFINE)
+    return: Итератор словарей по уровням
+    """
+    coefficients = _resolve_affine(l_b, r_b, affine, detect)
+    if _affine_level(0, root, coefficients) is not None:
+        for level in range(levels):
+            first, step, a = _affine_level(level, root, coefficients)
+            powers = [a ** j for j in range(level)]
+            # D пробегает все суммы подмножеств степеней a
+            low = step * sum(p for p in powers if p < 0)
+            high = step * sum(p for p in powers if p > 0)
+            count = 2 ** level
+            yield {'level': level, 'count': count,
+                   'sum': count * first + step * sum(powers) * count // 2,
+                   'min': first + min(low, high), 'max': first + max(low, high)}
+        return
+    values: List[int] = [root]
+    for level in range(levels):
+        if level:
+            values = [child for node in values for child in (l_b(node), r_b(node))]
+        yield {'level': level, 'count': len(values), 'sum': sum(values),
+               'min': min(values), 'max': max(values)}
+
+
+def tree_stats(height: int = 6, root: int = 15,
+               l_b: Callable[[int], int] = left_branch,
+               r_b: Callable[[int], int] = right_branch,
+               affine: Optional[Tuple[Affine, Affine]] = None,
+               detect: bool = False) -> Dict[str, Union[int, List[Dict[str, int]]]]:
+    """
+    Сводная статистика дерева gen_bin_tree без его построения.
+
+    height: Высота дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    affine: Коэффициенты ((a_l, b_l), (a_r, b_r)), если известны
+    detect: Подбирать коэффициенты произвольных ветвей по точкам
+        (affine_coefficients); без него формулы применяются только
+        к left_branch и right_branch (KNOWN_AFFINE)
+    return: Словарь: levels (статистика по уровням), nodes, leaves, sum, min, max
+    """
+    return summarize_levels(iter_level_stats(max(height, 0) + 1, root, l_b, r_b, affine, detect))
+
+
+def summarize_levels(stats: Iterator[Dict[str, int]]) -> Dict[str, Union[int, List[Dict[str, int]]]]:
+    """Собирает итог по статистике уровней из iter_level_stats."""
+    levels = list(stats)
+    if not levels:
+        return {'levels': [], 'nodes': 0, 'leaves': 0, 'sum': 0, 'min': None, 'max': None}
+    return {
+        'levels': levels,
+        'nodes': sum(s['count'] for s in levels),
+        'leaves': levels[-1]['count'],
+        'sum': sum(s['sum'] for s in levels),
+        'min': min(s['min'] for s in levels),
+        'max': max(s['max'] for s in levels),
+    }
+
+
+def find_value(x: int, levels: int, root: int = 15,
+               l_b: Callable[[int], int] = left_branch,
+               r_b: Callable[[int], int] = right_branch,
+               affine: Optional[Tuple[Affine, Affine]] = None,
+               detect: bool = False) -> Iterator[Tuple[int, int]]:
+    """
+    Где в дереве встречается значение x: пары (уровень, номер на уровне).
+
+    Для аффинных ветвей с общим множителем |a| >= 2 номер на каждом
+    уровне находится обратным разложением (x - first) / step по степеням a
+    за O(level). Иначе уровни перебираются по одному.
+
+    x: Искомое значение
+    levels: Количество уровней
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    affine: Коэффициенты ((a_l, b_l), (a_r, b_r)), если известны
+    detect: Подбирать коэффициенты произвольных ветвей по точкам
+        (affine_coefficients); без него формулы применяются только
+        к left_branch и right_branch (KNOWN_AFFINE)
+    return: Итератор пар (уровень, номер); узел в кучевой раскладке — 2 ** уровень - 1 + номер
+    """
+    coefficients = _resolve_affine(l_b, r_b, affine, detect)
+    if _affine_level(0, root, coefficients) is not None:
+        for level in range(levels):
+            first, step, a = _affine_level(level, root, coefficients)
+            if (x - first) % step:
+                continue
+            digits = (x - first) // step
+            index = 0
+            for shift in range(level):
+                bit = digits % abs(a)
+                if bit > 1:
+                    break
+                index |= bit << shift
+                digits = (digits - bit) // a
+            else:
+                if digits == 0:
+                    yield level, index
+        return
+    values: List[int] = [root]
+    for level in range(levels):
+        if level:
+            values = [child for node in values for child in (l_b(node), r_b(node))]
+        for index, value in enumerate(values):
+            if value == x:
+                yield level, index
+
+
+class JoinedTree(HeapLayout):
+    """
+    Дерево, склеенное из верхней части top (split уровней) и 2 ** split
+    поддеревьев, корни которых — потомки листьев top. Поддеревья не
+    копируются: индекс узла пересчитывается в (поддерево, локальный индекс).
+    """
+
+    def __init__(self, top: HeapLayout, subtrees: Sequence[HeapLayout]) -> None:
+        self.top = top
+        self.subtrees = subtrees
+        self.split = top.levels
+        self.levels = top.levels + subtrees[0].levels
+
+    def value(self, i: int) -> int:
+        """Значение узла i."""
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        level = self.level(i)
+        if level < self.split:
+            return self.top.value(i)
+        depth = level - self.split
+        position = i - (2 ** level - 1)
+        subtree = self.subtrees[position >> depth]
+        return subtree.value(2 ** depth - 1 + (position & (2 ** depth - 1)))
+
+    def to_heap(self) -> HeapTree:
+        """Сплошной HeapTree (с копированием значений)."""
+        values: MutableSequence[int] = array('q')
+        try:
+            values.extend(self.value(i) for i in range(len(self)))
+        except OverflowError:
+            values = [self.value(i) for i in range(len(self))]
+        return HeapTree(values, self.top.l_b, self.top.r_b)
+
+
+def _build_part(levels: int, root: int, l_b: Callable[[int], int],
+                r_b: Callable[[int], int], form: str) -> Union[HeapTree, Tree]:
+    """Строит одно поддерево в процессе пула."""
+    tree = build_heap(levels, root, l_b, r_b)
+    return tree.to_dict() if form == 'dict' else tree
+
+
+def build_heap_parallel(levels: int, root: int,
+                        l_b: Callable[[int], int] = left_branch,
+                        r_b: Callable[[int], int] = right_branch,
+                        split: Optional[int] = None,
+                        workers: Optional[int] = None,
+                        form: str = 'compact') -> Union[HeapLayout, Tree]:
+    """
+    Параллельное построение дерева из levels уровней: дерево разрезается
+    на глубине split, верхняя часть строится сразу, а 2 ** split поддеревьев —
+    независимо в пуле процессов. Функции ветвей должны передаваться
+    в другие процессы (функции уровня модуля, не lambda).
+
+    levels: Количество уровней
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    split: Глубина разреза (по умолчанию — чтобы задач было не меньше 2 * workers);
+        при split <= 0 дерево строится последовательно
+    workers: Количество процессов (по умолчанию — число ядер)
+    form: 'compact' — JoinedTree поверх HeapTree поддеревьев без копирования;
+        'dict' — словарь, в который поддеревья вставляются по ссылке
+    return: Дерево в выбранной форме
+    """
+    workers = workers or os.cpu_count() or 1
+    if split is None:
+        split = max(1, (2 * workers - 1).bit_length())
+    if split <= 0 or levels <= split:  # разрезать нечего — последовательно
+        tree = build_heap(levels, root, l_b, r_b)
+        return tree.to_dict() if form == 'dict' else tree
+    top = build_heap(split, root, l_b, r_b)
+    roots = [child for node in top.level_values(split - 1) for child in (l_b(node), r_b(node))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_build_part, [levels - split] * len(roots), roots,
+                              [l_b] * len(roots), [r_b] * len(roots), [form] * len(roots)))
+    if form != 'dict':
+        return JoinedTree(top, parts)
+    return _join_dict(top, 0, parts)
+
+
+def _join_dict(top: HeapTree, i: int, parts: List[Tree]) -> Tree:
+    """Словарь верхней части, в листья которой вставлены поддеревья parts."""
+    children = top.children(i)
+    if children:
+        return {str(top.value(i)): [_join_dict(top, c, parts) for c in children]}
+    first = 2 * (i - (2 ** (top.levels - 1) - 1))  # номер первого поддерева листа i
+    return {str(top.value(i)): parts[first:first + 2]}
+
+
+def gen_bin_tree_parallel(height: int = 6, root: int = 15,
+                          l_b: Callable[[int], int] = left_branch,
+                          r_b: Callable[[int], int] = right_branch,
+                          split: Optional[int] = None,
+                          workers: Optional[int] = None,
+                          form: str = 'compact') -> Union[HeapLayout, Tree]:
+    """
+    Параллельный вариант gen_bin_tree (см. build_heap_parallel).
+
+    height: Высота дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    split: Глубина разреза
+    workers: Количество процессов
+    form: 'compact' или 'dict'
+    return: Дерево в выбранной форме
+    """
+    return build_heap_parallel(max(height, 0) + 1, root, l_b, r_b, split, workers, form)
+
+
+def iter_json(levels: int, root: int = 15,
+              l_b: Callable[[int], int] = left_branch,
+              r_b: Callable[[int], int] = right_branch) -> Iterator[str]:
+    """
+    Куски JSON дерева в формате gen_bin_tree ({"значение": [потомки]}),
+    вычисляемые обходом в глубину с явным стеком: в памяти O(levels),
+    сам словарь не строится. Склеенный результат совпадает
+    с json.dumps(gen_bin_tree(...)).
+    """
+    if levels <= 0:
+        yield '{}'
+        return
+    stack: List[tuple] = [(root, levels - 1)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+        value, depth = item
+        if depth <= 0:
+            yield f'{{"{value}": []}}'
+            continue
+        yield f'{{"{value}": ['
+        stack.extend((']}', (r_b(value), depth - 1), ', ', (l_b(value), depth - 1)))
+
+
+def iter_ndjson(levels: int, root: int = 15,
+                l_b: Callable[[int], int] = left_branch,
+                r_b: Callable[[int], int] = right_branch) -> Iterator[str]:
+    """
+    Строки NDJSON по одной на узел в прямом порядке обхода:
+    {"id": индекс в кучевой раскладке, "parent": индекс родителя или null,
+    "level": уровень, "value": значение}. Память — O(levels).
+    """
+    if levels <= 0:
+        return
+    stack: List[Tuple[int, int, int]] = [(0, root, 0)]
+    while stack:
+        i, value, level = stack.pop()
+        parent = (i - 1) // 2 if i else 'null'
+        yield f'{{"id": {i}, "parent": {parent}, "level": {level}, "value": {value}}}\n'
+        if level + 1 < levels:
+            stack.append((2 * i + 2, r_b(value), level + 1))
+            stack.append((2 * i + 1, l_b(value), level + 1))
+
+
+def write_chunks(out: IO, chunks: Iterator[str], buffer_size: int = 1 << 16) -> int:
+    """
+    Пишет куски текста в out крупными блоками (не меньше buffer_size
+    символов за вызов write). Подходит и текстовый, и двоичный файл
+    (тогда текст кодируется в UTF-8). Возвращает число записанных символов.
+    """
+    try:
+        out.write('')
+        binary = False
+    except TypeError:
+        binary = True
+    parts: List[str] = []
+    size = total = 0
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            block = ''.join(parts)
+            out.write(block.encode() if binary else block)
+            total += size
+            parts, size = [], 0
+    if parts:
+        block = ''.join(parts)
+        out.write(block.encode() if binary else block)
+        total += size
+    return total
+
+
+def write_tree(out: IO, height: int = 6, root: int = 15,
+               l_b: Callable[[int], int] = left_branch,
+               r_b: Callable[[int], int] = right_branch,
+               fmt: str = 'json', buffer_size: int = 1 << 16) -> int:
+    """
+    Потоковая запись дерева gen_bin_tree в файл без построения словаря.
+
+    out: Файл (или любой объект с методом write)
+    height: Высота дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    fmt: 'json' — вложенный формат gen_bin_tree, 'ndjson' — строка на узел
+    buffer_size: Размер блока записи в символах
+    return: Количество записанных символов
+    """
+    make = iter_ndjson if fmt == 'ndjson' else iter_json
+    return write_chunks(out, make(max(height, 0) + 1, root, l_b, r_b), buffer_size)
+
+
+# Граница, после которой следующий уровень считается в целых числах Python
+INT64_SAFE = 2 ** 62
+
+
+def iter_levels_numpy(levels: int, root: int, l_b: Callable = left_branch,
+                      r_b: Callable = right_branch) -> Iterator:
+    """
+    Генерирует уровни дерева массивами NumPy: каждый следующий уровень
+    получается из предыдущего двумя векторными вызовами l_b и r_b
+    (функции должны работать с массивами, как left_branch и right_branch).
+
+    Пока значения помещаются в int64, уровни имеют dtype int64. Если
+    следующий уровень может переполниться (проверяются крайние узлы
+    и величина результата), он пересчитывается в массиве dtype=object
+    с целыми числами Python, и дальше используется только он.
+
+    levels: Количество уровней
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    return: Итератор по уровням (массивы длины 1, 2, 4, ...)
+    """
+    import numpy as np
+
+    if levels <= 0:
+        return
+    level = np.array([root], dtype=np.int64 if -INT64_SAFE < root < INT64_SAFE else object)
+    yield level
+    for _ in range(levels - 1):
+        level = _next_level_numpy(level, l_b, r_b)
+        yield level
+
+
+def _next_level_numpy(level, l_b: Callable, r_b: Callable):
+    """Следующий уровень: потомки каждого узла level, при угрозе переполнения — dtype=object."""
+    import numpy as np
+
+    following = np.empty(2 * len(level), dtype=level.dtype)
+    following[0::2] = l_b(level)
+    following[1::2] = r_b(level)
+    if level.dtype != object and not _fits_int64(level, following, l_b, r_b):
+        level = level.astype(object)
+        following = np.empty(2 * len(level), dtype=object)
+        following[0::2] = l_b(level)
+        following[1::2] = r_b(level)
+    return following
+
+
+def _fits_int64(level, following, l_b: Callable, r_b: Callable) -> bool:
+    """Проверяет, что уровень following посчитан в int64 без переполнения."""
+    if following.max() >= INT64_SAFE or following.min() <= -INT64_SAFE:
+        return False
+    for k in {int(level.argmin()), int(level.argmax())}:
+        node = int(level[k])
+        if l_b(node) != following[2 * k] or r_b(node) != following[2 * k + 1]:
+            return False
+    return True
+
+
+def build_heap_numpy(levels: int, root: int, l_b: Callable = left_branch,
+                     r_b: Callable = right_branch) -> HeapTree:
+    """
+    Строит HeapTree из уровней iter_levels_numpy в одном массиве NumPy
+    (int64, а после переполнения — dtype=object).
+
+    levels: Количество уровней
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    return: Компактное дерево
+    """
+    import numpy as np
+
+    values = np.empty(2 ** max(levels, 0) - 1, dtype=np.int64)
+    for depth, level in enumerate(iter_levels_numpy(levels, root, l_b, r_b)):
+        if level.dtype == object and values.dtype != object:
+            values = values.astype(object)
+        values[2 ** depth - 1:2 ** (depth + 1) - 1] = level
+    return HeapTree(values, l_b, r_b)
+
+
+def gen_bin_tree_numpy(height: int = 6, root: int = 15,
+                       l_b: Callable = left_branch,
+                       r_b: Callable = right_branch) -> HeapTree:
+    """
+    Векторное построение дерева gen_bin_tree по уровням (см. iter_levels_numpy).
+
+    height: Высота дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    return: HeapTree; to_dict() даёт результат gen_bin_tree
+    """
+    return build_heap_numpy(max(height, 0) + 1, root, l_b, r_b)
+
+
+# Файл дерева: заголовок TREE_HEADER, описание корня и ветвей (JSON),
+# выравнивание до 8 байт, значения int64 little-endian в кучевом порядке
+# и раздел больших чисел (записи TREE_BIG_ENTRY, за каждой — байты числа)
+TREE_MAGIC = b'LAB3TREE'
+TREE_VERSION = 1
+# magic, версия, levels, длина описания, смещение и число больших чисел
+TREE_HEADER = struct.Struct('<8sIIQQQ')
+# Индекс узла и длина числа в байтах
+TREE_BIG_ENTRY = struct.Struct('<QI')
+# Метка в ячейке значения, которое вынесено в раздел больших чисел
+TREE_BIG = -2 ** 63
+
+
+def _align8(n: int) -> int:
+    return (n + 7) // 8 * 8
+
+
+def _branch_spec(func: Callable[[int], int], coefficients: Optional[Affine]) -> Dict[str, object]:
+    """Описание функции ветви: имя для импорта и коэффициенты, если она аффинна."""
+    spec: Dict[str, object] = {'name': f'{func.__module__}.{func.__qualname__}'}
+    if coefficients is not None:
+        spec['affine'] = list(coefficients)
+    return spec
+
+
+def _load_branch(spec: Dict[str, object], load: bool) -> Optional[Callable[[int], int]]:
+    """
+    Функция ветви по описанию _branch_spec: по коэффициентам, а при load —
+    импортом модуля по имени. None, если её не восстановить.
+    """
+    if 'affine' in spec:
+        a, b = spec['affine']
+        return _affine(a, b)
+    module, _, name = str(spec['name']).rpartition('.')
+    if not load or '<' in name:
+        return None
+    try:
+        return getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError, ValueError):
+        return None
+
+
+def _pack_values(values: Sequence[int], first: int, big: Dict[int, int]) -> bytes:
+    """Байты int64 для values; не помещающиеся в int64 числа уходят в big с меткой TREE_BIG."""
+    try:
+        block = array('q', values)
+        clean = TREE_BIG not in block
+    except OverflowError:
+        clean = False
+    if not clean:
+        block = array('q')
+        for j, value in enumerate(values):
+            if TREE_BIG < value < -TREE_BIG:
+                block.append(value)
+            else:
+                block.append(TREE_BIG)
+                big[first + j] = value
+    if sys.byteorder != 'little':
+        block.byteswap()
+    return block.tobytes()
+
+
+def _unpack_values(data: bytes, first: int, big: Dict[int, int]) -> List[int]:
+    """Обратное к _pack_values: значения с подстановкой больших чисел."""
+    block = array('q')
+    block.frombytes(data)
+    if sys.byteorder != 'little':
+        block.byteswap()
+    values = block.tolist()
+    if TREE_BIG in block:
+        values = [big[first + j] if value == TREE_BIG else value for j, value in enumerate(values)]
+    return values
+
+
+def save_heap(path: str, levels: int, root: int = 15,
+              l_b: Callable[[int], int] = left_branch,
+              r_b: Callable[[int], int] = right_branch,
+              chunk: int = 1 << 16,
+              affine: Optional[Tuple[Affine, Affine]] = None,
+              detect: bool = False) -> int:
+    """
+    Записывает дерево из levels уровней (0 — пустое дерево) в двоичный
+    файл для TreeFile.
+
+    Уровни пишутся на диск по очереди блоками по chunk узлов: родители
+    следующего уровня читаются обратно из уже записанной части файла,
+    поэтому в памяти держится O(chunk) значений (плюс числа, не
+    поместившиеся в int64). Для аффинных ветвей с множителем 2 уровень
+    берётся готовым из level_values без вызова функций, а коэффициенты
+    записываются в описание ветвей.
+
+    path: Путь к файлу
+    levels: Количество уровней дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    chunk: Размер блока записи в узлах
+    affine: Коэффициенты ((a_l, b_l), (a_r, b_r)), если известны
+    detect: Подбирать коэффициенты по точкам (см. level_values)
+    return: Количество записанных узлов
+    """
+    levels = max(levels, 0)
+    coefficients = _resolve_affine(l_b, r_b, affine, detect)
+    spec = json.dumps({
+        'root': root,
+        'left': _branch_spec(l_b, coefficients and coefficients[0]),
+        'right': _branch_spec(r_b, coefficients and coefficients[1]),
+    }).encode()
+    start = _align8(TREE_HEADER.size + len(spec))
+    ranged = coefficients is not None and coefficients[0][0] == coefficients[1][0] == 2 \
+        and coefficients[0][1] != coefficients[1][1]
+    big: Dict[int, int] = {}
+    with open(path, 'w+b') as f:
+        f.write(TREE_HEADER.pack(TREE_MAGIC, TREE_VERSION, levels, len(spec), 0, 0))
+        f.write(spec)
+        f.write(bytes(start - f.tell()))
+        for level in range(levels):
+            first = 2 ** level - 1
+            if level == 0:
+                f.write(_pack_values([root], 0, big))
+            elif ranged:
+                values = level_values(level, root, affine=coefficients)
+                for k in range(0, len(values), chunk):
+                    f.write(_pack_values(values[k:k + chunk], first + k, big))
+            else:
+                parents_first = 2 ** (level - 1) - 1
+                step = max(chunk // 2, 1)
+                for k in range(0, 2 ** (level - 1), step):
+                    count = min(step, 2 ** (level - 1) - k)
+                    end = f.tell()
+                    f.seek(start + 8 * (parents_first + k))
+                    parents = _unpack_values(f.read(8 * count), parents_first + k, big)
+                    f.seek(end)
+                    children = [child for node in parents for child in (l_b(node), r_b(node))]
+                    f.write(_pack_values(children, first + 2 * k, big))
+        big_offset = f.tell()
+        for index in sorted(big):
+            value = big[index]
+            data = value.to_bytes(value.bit_length() // 8 + 1, 'little', signed=True)
+            f.write(TREE_BIG_ENTRY.pack(index, len(data)))
+            f.write(data)
+        f.seek(0)
+        f.write(TREE_HEADER.pack(TREE_MAGIC, TREE_VERSION, levels, len(spec), big_offset, len(big)))
+    return 2 ** levels - 1
+
+
+def write_tree_file(path: str, height: int = 6, root: int = 15,
+                    l_b: Callable[[int], int] = left_branch,
+                    r_b: Callable[[int], int] = right_branch,
+                    chunk: int = 1 << 16,
+                    affine: Optional[Tuple[Affine, Affine]] = None,
+                    detect: bool = False) -> int:
+    """
+    Запись дерева gen_bin_tree в файл для TreeFile (см. save_heap).
+
+    path: Путь к файлу
+    height: Высота дерева
+    root: Значение корня дерева
+    l_b: Функция вычисления левого потомка
+    r_b: Функция вычисления правого потомка
+    chunk: Размер блока записи в узлах
+    affine: Коэффициенты ((a_l, b_l), (a_r, b_r)), если известны
+    detect: Подбирать коэффициенты по точкам (см. level_values)
+    return: Количество записанных узлов
+    """
+    return save_heap(path, max(height, 0) + 1, root, l_b, r_b, chunk, affine, detect)
+
+
+class TreeFile(HeapLayout):
+    """
+    Дерево из файла save_heap (write_tree_file) без загрузки в память.
+
+    Файл отображается в память через mmap, значение узла читается из
+    memoryview.cast('q') по запросу, поэтому навигация HeapLayout
+    (left, right, parent, children, to_dict) работает и для деревьев
+    из миллиардов узлов. Числа из раздела больших чисел читаются
+    в словарь при открытии. Корень и ветви восстанавливаются из
+    описания при первом обращении к l_b и r_b: аффинные — по
+    коэффициентам, остальные — импортом модуля по имени, только если
+    import_branches=True (открытие файла не выполняет чужой код).
+    Невосстановимые ветви (lambda или без разрешения) равны None.
+    """
+
+    def __init__(self, path: str, import_branches: bool = False) -> None:
+        self._file = open(path, 'rb')
+        head = self._file.read(TREE_HEADER.size)
+        if len(head) < TREE_HEADER.size or head[:len(TREE_MAGIC)] != TREE_MAGIC:
+            self._file.close()
+            raise ValueError(f'Файл {path} не является файлом дерева')
+        _, version, levels, spec_size, big_offset, big_count = TREE_HEADER.unpack(head)
+        if version != TREE_VERSION:
+            self._file.close()
+            raise ValueError(f'Неподдерживаемая версия файла дерева: {version}')
+        spec = json.loads(self._file.read(spec_size))
+        self.levels = levels
+        self.root: int = spec['root']
+        self.import_branches = import_branches
+        self._spec: Dict[str, Dict[str, object]] = spec
+        self._branches: Dict[str, Optional[Callable[[int], int]]] = {}
+        self._big: Dict[int, int] = {}
+        self._file.seek(big_offset)
+        for _ in range(big_count):
+            index, size = TREE_BIG_ENTRY.unpack(self._file.read(TREE_BIG_ENTRY.size))
+            self._big[index] = int.from_bytes(self._file.read(size), 'little', signed=True)
+        start = _align8(TREE_HEADER.size + spec_size)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)[start:start + 8 * len(self)].cast('q')
+        self._swap: bool = sys.byteorder != 'little'
+
+    def _branch(self, side: str) -> Optional[Callable[[int], int]]:
+        if side not in self._branches:
+            self._branches[side] = _load_branch(self._spec[side], self.import_branches)
+        return self._branches[side]
+
+    @property
+    def l_b(self) -> Optional[Callable[[int], int]]:
+        """Функция левой ветви из описания (или None)."""
+        return self._branch('left')
+
+    @property
+    def r_b(self) -> Optional[Callable[[int], int]]:
+        """Функция правой ветви из описания (или None)."""
+        return self._branch('right')
+
+    def value(self, i: int) -> int:
+        """Значение узла i."""
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        value: int = self._view[i]
+        if self._swap:
+            value = int.from_bytes(value.to_bytes(8, 'big', signed=True), 'little', signed=True)
+        return self._big[i] if value == TREE_BIG else value
+
+    def level_values(self, level: int) -> List[int]:
+        """Значения всех узлов уровня level слева направо."""
+        first = 2 ** level - 1
+        return _unpack_values(self._view[first:2 * first + 1].tobytes(), first, self._big)
+
+    def close(self) -> None:
+        """Освобождает memoryview, mmap и файл."""
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'TreeFile':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 if __name__ == "__main__":
     # Генерация дерева
     tree = gen_bin_tree(height=6, root=15)
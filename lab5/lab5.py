@@ -1,7 +1,12 @@
+import os
+import time
 from collections import deque
-from typing import Callable, Dict, List
+from typing import IO, TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
 from pprint import pprint
 
+if TYPE_CHECKING:
+    from lab3 import HeapTree, TreeFile, TreeView, Visit
+
 
 def gen_bin_tree(
         height: int = 6,
@@ -39,6 +44,165 @@ def gen_bin_tree(
     return tree
 
 
+def gen_bin_tree_compact(
+        height: int = 6,
+        root: int = 15,
+        left_branch: Callable[[int], int] = lambda x: 2 * (x + 1),
+        right_branch: Callable[[int], int] = lambda x: 2 * (x - 1)
+) -> 'HeapTree':
+    """ Компактный вариант gen_bin_tree: значения узлов лежат в одном массиве
+    в кучевом порядке (потомки узла i — 2i+1 и 2i+2). height — число уровней,
+    как и в gen_bin_tree; to_dict() возвращает тот же словарь. """
+    from lab3 import build_heap
+
+    return build_heap(height, root, left_branch, right_branch)
+
+
+def gen_bin_tree_numpy(
+        height: int = 6,
+        root: int = 15,
+        left_branch: Callable = lambda x: 2 * (x + 1),
+        right_branch: Callable = lambda x: 2 * (x - 1)
+) -> 'HeapTree':
+    """ Векторный вариант gen_bin_tree_compact: вместо очереди каждый уровень
+    строится из предыдущего двумя операциями над массивом NumPy. При угрозе
+    переполнения int64 значения переводятся в целые числа Python. """
+    from lab3 import build_heap_numpy
+
+    return build_heap_numpy(height, root, left_branch, right_branch)
+
+
+def gen_bin_tree_lazy(
+        height: int = 6,
+        root: int = 15,
+        left_branch: Callable[[int], int] = lambda x: 2 * (x + 1),
+        right_branch: Callable[[int], int] = lambda x: 2 * (x - 1),
+        cache_size: int = 4096
+) -> 'TreeView':
+    """ Ленивое дерево из height уровней: значение узла вычисляется только
+    вдоль пути от корня при обращении, посещённые узлы хранятся
+    в ограниченном LRU-кеше на cache_size узлов. """
+    from lab3 import TreeView
+
+    return TreeView(height, root, left_branch, right_branch, cache_size)
+
+
+def tree_stats(
+        height: int = 6,
+        root: int = 15,
+        left_branch: Callable[[int], int] = lambda x: 2 * (x + 1),
+        right_branch: Callable[[int], int] = lambda x: 2 * (x - 1),
+        affine: Optional[tuple] = None
+) -> dict:
+    """ Суммы, минимумы и максимумы по уровням, число узлов и листьев дерева
+    из height уровней без построения словаря: по формулам, если заданы
+    коэффициенты ветвей affine = ((a_l, b_l), (a_r, b_r)), иначе потоково,
+    по одному уровню за раз. """
+    from lab3 import iter_level_stats, summarize_levels
+
+    return summarize_levels(iter_level_stats(height, root, left_branch, right_branch, affine))
+
+
+def gen_bin_tree_parallel(
+        height: int = 6,
+        root: int = 15,
+        left_branch: Optional[Callable[[int], int]] = None,
+        right_branch: Optional[Callable[[int], int]] = None,
+        split: Optional[int] = None,
+        workers: Optional[int] = None,
+        form: str = 'compact'
+):
+    """ Параллельное построение дерева из height уровней: дерево режется на
+    глубине split, поддеревья строятся в пуле процессов и склеиваются без
+    копирования (JoinedTree для form='compact', вставка по ссылке для 'dict').
+    Функции ветвей должны быть функциями уровня модуля, а не lambda, поэтому
+    по умолчанию (None) используются равносильные им lab3.left_branch и right_branch. """
+    import lab3
+
+    return lab3.build_heap_parallel(height, root, left_branch or lab3.left_branch,
+                                    right_branch or lab3.right_branch, split, workers, form)
+
+
+def parallel_speedup(
+        height: int = 22,
+        root: int = 15,
+        workers: Optional[List[int]] = None,
+        split: Optional[int] = None,
+        form: str = 'compact'
+) -> List[Dict[str, float]]:
+    """ Ускорение gen_bin_tree_parallel относительно последовательного
+    построения той же формы (gen_bin_tree_compact или gen_bin_tree) для
+    разного числа процессов: 1, 2, 4, ... до числа ядер. """
+    import lab3
+
+    cores = os.cpu_count() or 1
+    if workers is None:
+        workers = sorted({min(2 ** k, cores) for k in range(cores.bit_length() + 1)})
+    started = time.perf_counter()
+    if form == 'dict':
+        gen_bin_tree(height, root, lab3.left_branch, lab3.right_branch)
+    else:
+        lab3.build_heap(height, root, lab3.left_branch, lab3.right_branch)
+    base = time.perf_counter() - started
+    report = []
+    for count in workers:
+        started = time.perf_counter()
+        gen_bin_tree_parallel(height, root, split=split, workers=count, form=form)
+        seconds = time.perf_counter() - started
+        report.append({'workers': count, 'seconds': seconds, 'speedup': base / seconds})
+    return report
+
+
+def write_tree(
+        out: IO,
+        height: int = 6,
+        root: int = 15,
+        left_branch: Callable[[int], int] = lambda x: 2 * (x + 1),
+        right_branch: Callable[[int], int] = lambda x: 2 * (x - 1),
+        fmt: str = 'json',
+        buffer_size: int = 1 << 16
+) -> int:
+    """ Потоковая запись дерева из height уровней в файл без построения
+    словаря: 'json' — тот же вложенный формат, что у gen_bin_tree,
+    'ndjson' — строка на узел. Память — O(height), запись крупными блоками. """
+    from lab3 import iter_json, iter_ndjson, write_chunks
+
+    make = iter_ndjson if fmt == 'ndjson' else iter_json
+    return write_chunks(out, make(height, root, left_branch, right_branch), buffer_size)
+
+
+def write_tree_file(
+        path: str,
+        height: int = 6,
+        root: int = 15,
+        left_branch: Callable[[int], int] = lambda x: 2 * (x + 1),
+        right_branch: Callable[[int], int] = lambda x: 2 * (x - 1),
+        chunk: int = 1 << 16
+) -> 'TreeFile':
+    """ Записывает дерево из height уровней в двоичный файл уровень за уровнем
+    и открывает его как TreeFile: значения читаются из файла через mmap,
+    навигация — как у gen_bin_tree_compact. """
+    from lab3 import TreeFile, save_heap
+
+    save_heap(path, height, root, left_branch, right_branch, chunk)
+    return TreeFile(path)
+
+
+def iter_tree(
+        height: int = 6,
+        root: int = 15,
+        left_branch: Callable[[int], int] = lambda x: 2 * (x + 1),
+        right_branch: Callable[[int], int] = lambda x: 2 * (x - 1),
+        order: str = 'pre'
+) -> Iterator['Visit']:
+    """ Ленивый обход дерева из height уровней с явным стеком (или очередью
+    для 'bfs'): кортежи (глубина, путь, значение) выдаются по одному,
+    обход можно прервать, не строя дерево целиком. """
+    from lab3 import iter_nodes
+
+    return iter_nodes(height, root, left_branch, right_branch, order)
+
+
 if __name__ == "__main__":
     tree = gen_bin_tree(height=6, root=15)
     pprint(tree)
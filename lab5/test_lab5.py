@@ -1,5 +1,16 @@
+import io
+import json
+import os
+import tempfile
 import unittest
-from lab5.lab5 import gen_bin_tree
+from lab3 import TreeGrower
+from lab5.lab5 import (gen_bin_tree, gen_bin_tree_compact, gen_bin_tree_lazy, gen_bin_tree_numpy,
+                       gen_bin_tree_parallel, iter_tree, parallel_speedup, tree_stats, write_tree,
+                       write_tree_file)
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestGenBinTreeSimple(unittest.TestCase):
@@ -52,6 +63,72 @@ class TestGenBinTreeSimple(unittest.TestCase):
         }
         self.assertEqual(tree, expected)
 
+    def test_compact_tree(self):
+        """Компактное дерево совпадает со словарём gen_bin_tree"""
+        for height in range(5):
+            self.assertEqual(gen_bin_tree_compact(height, 15).to_dict(), gen_bin_tree(height, 15))
+        tree = gen_bin_tree_compact(height=3, root=1)
+        self.assertEqual(tree.levels, 3)
+        self.assertEqual([tree.value(i) for i in tree.children(0)], [4, 0])
+
+    @unittest.skipIf(numpy is None, "numpy не установлен")
+    def test_numpy_tree(self):
+        """Векторное построение совпадает с очередью"""
+        for height in range(5):
+            self.assertEqual(gen_bin_tree_numpy(height, 15).to_dict(), gen_bin_tree(height, 15))
+
+    def test_lazy_tree(self):
+        """Ленивое дерево совпадает со словарём и хранит не больше cache_size узлов"""
+        for height in range(5):
+            self.assertEqual(gen_bin_tree_lazy(height, 15).to_dict(), gen_bin_tree(height, 15))
+        tree = gen_bin_tree_lazy(height=30, cache_size=5)
+        tree.value(len(tree) - 1)
+        self.assertEqual(tree.cached(), 5)
+
+    def test_tree_stats(self):
+        """Статистика без построения дерева"""
+        stats = tree_stats(height=3, root=1, left_branch=lambda x: x + 1, right_branch=lambda x: x * x)
+        self.assertEqual((stats['nodes'], stats['leaves']), (7, 4))
+        self.assertEqual(stats['sum'], 1 + 2 + 1 + 3 + 4 + 2 + 1)
+        self.assertEqual(tree_stats(height=0)['nodes'], 0)
+        self.assertEqual(tree_stats(height=30, affine=((2, 2), (2, -2)))['leaves'], 2 ** 29)
+
+    def test_grow_tree(self):
+        """Наращивание готового дерева на k уровней"""
+        grower = TreeGrower(gen_bin_tree(height=2, root=1), lambda x: 2 * (x + 1), lambda x: 2 * (x - 1))
+        self.assertEqual(grower.grow(2), gen_bin_tree(height=4, root=1))
+        tree = gen_bin_tree_compact(height=2, root=1)
+        self.assertEqual(tree.extend(2).to_dict(), gen_bin_tree(height=4, root=1))
+
+    def test_parallel_tree(self):
+        """Параллельное построение и отчёт об ускорении"""
+        self.assertEqual(gen_bin_tree_parallel(height=5, split=2, workers=2).to_dict(), gen_bin_tree(height=5))
+        self.assertEqual(gen_bin_tree_parallel(height=5, split=2, workers=2, form='dict'), gen_bin_tree(height=5))
+        report = parallel_speedup(height=6, workers=[1, 2], split=2)
+        self.assertEqual([row['workers'] for row in report], [1, 2])
+        self.assertTrue(all(row['speedup'] > 0 for row in report))
+
+    def test_write_tree(self):
+        """Потоковая запись в формате словаря gen_bin_tree"""
+        for height in range(4):
+            out = io.StringIO()
+            write_tree(out, height=height, root=1)
+            self.assertEqual(json.loads(out.getvalue()), gen_bin_tree(height=height, root=1))
+
+    def test_write_tree_file(self):
+        """Дерево в файле с навигацией как у компактного"""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "tree.bin")
+            tree = write_tree_file(path, height=4, root=1)
+            self.assertEqual(tree.to_dict(), gen_bin_tree(height=4, root=1))
+            self.assertEqual(tree.children(1), [3, 4])
+            tree.close()
+
+    def test_iter_tree(self):
+        """Обход в ширину в порядке уровней gen_bin_tree"""
+        self.assertEqual(list(iter_tree(height=0)), [])
+        self.assertEqual([value for _, _, value in iter_tree(height=2, root=1, order='bfs')], [1, 4, 0])
+
 
 if __name__ == "__main__":
     unittest.main()
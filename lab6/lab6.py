@@ -1,46 +1,196 @@
+import argparse
+import csv
+import gc
+import json
+import statistics
 import timeit
-import matplotlib.pyplot as plt
-import random
-from lab3 import *
-from lab5.lab5 import *
+from collections import deque
+from typing import Callable, Dict, List, Optional
 
+import lab3
+import lab5.lab5 as lab5
 
-def benchmark(func, root: int, height: int, l_b, r_b, repeat=5, number=10) -> float:
-    """Замеряет минимальное время выполнения программы."""
-    t = timeit.repeat(lambda: func(height, root, l_b, r_b), repeat=repeat, number=number)
-    return min(t)
+# Поля сводки в порядке столбцов CSV
+SUMMARY_FIELDS = ('min', 'median', 'q1', 'q3', 'iqr', 'mean', 'stddev', 'max', 'outliers_low', 'outliers_high')
 
 
-def main() -> None:
+def measure(stmt: Callable[[], object], repeat=5, number=10, warmup=1, gc_enabled=False,
+            collect=True) -> List[float]:
+    """Возвращает все замеры: время одного вызова stmt в каждом из repeat
+    повторов (по number вызовов). Первые warmup повторов выполняются,
+    но не учитываются. timeit отключает сборщик мусора на время замера;
+    gc_enabled=True оставляет его включённым, collect=True запускает
+    gc.collect() перед каждым повтором, чтобы мусор прошлых повторов
+    не собирался во время следующего."""
+    if repeat < 1:
+        raise ValueError(f"repeat должен быть не меньше 1, получено {repeat}")
+    timer = timeit.Timer(stmt, setup='gc.enable()' if gc_enabled else 'pass', globals={'gc': gc})
+    samples = []
+    for k in range(warmup + repeat):
+        if collect:
+            gc.collect()
+        seconds = timer.timeit(number) / number
+        if k >= warmup:
+            samples.append(seconds)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Сводка по замерам: минимум, медиана, квартили и межквартильный
+    размах, среднее, стандартное отклонение, максимум и число выбросов
+    по правилу Тьюки (дальше 1.5 * IQR от квартилей)."""
+    if not samples:
+        raise ValueError("нет замеров для сводки")
+    if len(samples) > 1:
+        q1, _, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+        stddev = statistics.stdev(samples)
+    else:
+        q1 = q3 = samples[0]
+        stddev = 0.0
+    iqr = q3 - q1
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'q1': q1,
+        'q3': q3,
+        'iqr': iqr,
+        'mean': statistics.fmean(samples),
+        'stddev': stddev,
+        'max': max(samples),
+        'outliers_low': sum(s < q1 - 1.5 * iqr for s in samples),
+        'outliers_high': sum(s > q3 + 1.5 * iqr for s in samples),
+    }
+
+
+def benchmark(func, root: int, height: int, l_b, r_b, repeat=5, number=10, warmup=1, gc_enabled=False) -> dict:
+    """Замеряет время построения дерева func(height, root, l_b, r_b):
+    сводка summarize и все замеры в поле 'samples' (секунды на вызов)."""
+    samples = measure(lambda: func(height, root, l_b, r_b), repeat, number, warmup, gc_enabled)
+    return {**summarize(samples), 'samples': samples}
+
+
+def builders() -> Dict[str, Callable]:
+    """Сравниваемые алгоритмы с общей сигнатурой (height, root, l_b, r_b)
+    и высотой в смысле lab3. У итеративного построения из lab5 высота —
+    число уровней, поэтому ему передаётся height + 1: деревья одинаковы."""
+    return {
+        'recursive': lab3.gen_bin_tree,
+        'iterative': lambda height, root, l_b, r_b: lab5.gen_bin_tree(height + 1, root, l_b, r_b),
+    }
+
+
+def run_suite(heights, root=15, repeat=5, number=10, warmup=1, gc_enabled=False,
+              funcs: Optional[Dict[str, Callable]] = None) -> List[dict]:
+    """Замеры всех алгоритмов на всех высотах: строка на пару
+    (алгоритм, высота) с числом узлов, сводкой и замерами."""
+    rows = []
+    for height in heights:
+        for name, func in (funcs or builders()).items():
+            stats = benchmark(func, root, height, lab3.left_branch, lab3.right_branch,
+                              repeat, number, warmup, gc_enabled)
+            rows.append({'name': name, 'height': height, 'nodes': 2 ** (height + 1) - 1, **stats})
+    return rows
+
+
+def traversal_throughput(root: int, height: int, orders=lab3.TRAVERSAL_ORDERS,
+                         repeat=5, number=10) -> dict:
+    """Сравнивает пропускную способность (узлов в секунду по медиане
+    замеров) рекурсивного построения lab3.gen_bin_tree и итеративных
+    обходов lab3.iter_tree (полный проход генератора для каждого порядка)."""
+    nodes = 2 ** (height + 1) - 1
+    stats = benchmark(lab3.gen_bin_tree, root, height, lab3.left_branch, lab3.right_branch, repeat, number)
+    result = {'recursive': nodes / stats['median']}
+    for order in orders:
+        samples = measure(lambda: deque(lab3.iter_tree(height, root, order=order), maxlen=0), repeat, number)
+        result[order] = nodes / statistics.median(samples)
+    return result
+
+
+def write_json(rows: List[dict], out) -> None:
+    """Записывает результаты со всеми замерами в JSON."""
+    json.dump(rows, out, indent=2)
+    out.write('\n')
+
+
+def write_csv(rows: List[dict], out) -> None:
+    """Записывает сводку в CSV: строка на пару (алгоритм, высота)."""
+    writer = csv.DictWriter(out, fieldnames=('name', 'height', 'nodes') + SUMMARY_FIELDS,
+                            extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def plot(rows: List[dict], path: str) -> None:
+    """Строит график медианы времени от высоты (с межквартильным размахом)
+    и сохраняет его в файл path. matplotlib загружается только здесь
+    и без окна, поэтому работает и на сервере."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    for name in dict.fromkeys(row['name'] for row in rows):
+        series = [row for row in rows if row['name'] == name]
+        ax.errorbar([row['height'] for row in series], [row['median'] for row in series],
+                    yerr=[[row['median'] - row['q1'] for row in series], [row['q3'] - row['median'] for row in series]],
+                    label=name, marker='o', capsize=3)
+    ax.set_xlabel("Высота дерева")
+    ax.set_ylabel("Время (сек)")
+    ax.set_title("Сравнение рекурсивного и итеративного построения дерева")
+    ax.legend()
+    ax.grid(True)
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def positive_int(text: str) -> int:
+    """Тип аргумента argparse: целое число не меньше 1."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"ожидается целое число не меньше 1, получено {value}")
+    return value
+
+
+def main(argv=None) -> None:
     """Сравнивает производительность рекурсивного и итеративного
-    алгоритмов построения бинарного дерева на разных высотах.
-    Строит график зависимости времени выполнения от высоты дерева
-    и выводит численные результаты в консоль."""
-    random.seed(42)
-    test_data = list(range(1, 16))
-
-    res_recursive = []
-    res_iterative = []
-
-    root_value = 15
-
-    for h in test_data:
-        res_recursive.append(benchmark(gen_bin_tree1, root_value, h, left_branch, right_branch))
-        res_iterative.append(benchmark(gen_bin_tree, root_value, h, left_branch, right_branch))
-
-    # Визуализация результатов
-    plt.plot(test_data, res_recursive, label="Рекурсивный", marker='o')
-    plt.plot(test_data, res_iterative, label="Итеративный", marker='x')
-    plt.xlabel("Высота дерева")
-    plt.ylabel("Время (сек)")
-    plt.title("Сравнение рекурсивного и итеративного построения дерева")
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    алгоритмов построения бинарного дерева на разных высотах без
+    графического окна: выводит сводку в консоль, по запросу сохраняет
+    результаты в JSON/CSV и график в файл."""
+    parser = argparse.ArgumentParser(description='Замеры построения бинарного дерева')
+    parser.add_argument('--max-height', type=int, default=15, help='высоты от 1 до этой')
+    parser.add_argument('--root', type=int, default=15)
+    parser.add_argument('--repeat', type=positive_int, default=5, help='число учитываемых повторов')
+    parser.add_argument('--number', type=positive_int, default=10, help='вызовов в одном повторе')
+    parser.add_argument('--warmup', type=int, default=1, help='неучитываемых повторов в начале')
+    parser.add_argument('--gc', action='store_true', help='не отключать сборщик мусора во время замеров')
+    parser.add_argument('--json', help='файл для результатов в JSON')
+    parser.add_argument('--csv', help='файл для сводки в CSV')
+    parser.add_argument('--plot', help='файл для графика (нужен matplotlib)')
+    parser.add_argument('--traversal', action='store_true', help='сравнить обходы iter_tree с построением')
+    args = parser.parse_args(argv)
+
+    rows = run_suite(range(1, args.max_height + 1), args.root, args.repeat, args.number, args.warmup, args.gc)
 
     # Вывод численных значений
-    for h, r, i in zip(test_data, res_recursive, res_iterative):
-        print(f"Высота {h}: рекурсивный = {r:.6f}s, итеративный = {i:.6f}s")
+    for row in rows:
+        print(f"Высота {row['height']}: {row['name']} = {row['median']:.6f}s "
+              f"(IQR {row['iqr']:.6f}s, σ {row['stddev']:.6f}s, "
+              f"выбросов {row['outliers_low'] + row['outliers_high']})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as out:
+            write_json(rows, out)
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8', newline='') as out:
+            write_csv(rows, out)
+    if args.plot:
+        plot(rows, args.plot)
+
+    # Пропускная способность обходов по сравнению с рекурсивным построением
+    if args.traversal:
+        for name, rate in traversal_throughput(args.root, args.max_height, repeat=args.repeat,
+                                               number=args.number).items():
+            print(f"{name}: {rate:,.0f} узлов/с")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+import contextlib
+import io
+import json
+import unittest
+from lab6.lab6 import main, measure, run_suite, summarize, write_csv, write_json
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_summarize(self):
+        """Медиана, квартили и выбросы по правилу Тьюки"""
+        stats = summarize([1.0, 2.0, 3.0, 4.0, 100.0])
+        self.assertEqual((stats['median'], stats['q1'], stats['q3'], stats['iqr']), (3.0, 2.0, 4.0, 2.0))
+        self.assertEqual((stats['outliers_low'], stats['outliers_high']), (0, 1))
+        self.assertEqual((stats['min'], stats['max'], stats['mean']), (1.0, 100.0, 22.0))
+
+    def test_single_sample(self):
+        """Один замер: разброс нулевой"""
+        stats = summarize([0.5])
+        self.assertEqual((stats['median'], stats['iqr'], stats['stddev']), (0.5, 0.0, 0.0))
+
+    def test_no_samples(self):
+        """Без замеров — понятная ошибка, а в командной строке --repeat 0 отклоняется"""
+        with self.assertRaises(ValueError):
+            summarize([])
+        with self.assertRaises(ValueError):
+            measure(lambda: None, repeat=0)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(['--max-height', '1', '--repeat', '0'])
+
+    def test_measure_warmup(self):
+        """Прогревочные повторы не попадают в замеры"""
+        calls = []
+        samples = measure(lambda: calls.append(1), repeat=3, number=2, warmup=2)
+        self.assertEqual((len(samples), len(calls)), (3, 10))
+
+    def test_suite_output(self):
+        """Оба алгоритма на каждой высоте, запись в JSON и CSV"""
+        rows = run_suite([1, 2], repeat=2, number=1, warmup=0)
+        self.assertEqual([(row['name'], row['height']) for row in rows],
+                         [('recursive', 1), ('iterative', 1), ('recursive', 2), ('iterative', 2)])
+        self.assertEqual(rows[2]['nodes'], 7)
+        out = io.StringIO()
+        write_json(rows, out)
+        self.assertEqual(len(json.loads(out.getvalue())[0]['samples']), 2)
+        out = io.StringIO()
+        write_csv(rows, out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[0].startswith('name,height,nodes,min,median'))
+
+
+if __name__ == "__main__":
+    unittest.main()
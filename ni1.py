@@ -1,20 +1,664 @@
-def f(s, target):
+import bisect
+import heapq
+import json
+import mmap
+import operator
+import os
+import sys
+import tempfile
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+ERROR_TARGET = 'Значение целевой суммы должно быть больше нуля'
+ERROR_LENGTH = 'Введите минимум два целых положительных числа'
+ERROR_NUMBERS = 'Введите только целые положительные числа'
+NO_PAIR = 'Нет подходящей пары для достижения целевой суммы'
+ERROR_JOB = 'Некорректное задание'
+
+
+def check_numbers(s):
+    """Однократная проверка списка: все элементы — целые положительные числа."""
+    for value in s:
+        if not isinstance(value, int) or value <= 0:
+            return ERROR_NUMBERS
+    return None
+
+
+def check_target(target, size):
+    """Проверка целевой суммы и длины списка (в том же порядке, что и в f)."""
     if isinstance(target, int):
         if target <= 0:
-            return 'Значение целевой суммы должно быть больше нуля'
-    if len(s) < 2:
-        return 'Введите минимум два целых положительных числа'
-    for i in range(len(s)):
-        for j in range(len(s)):
-            if isinstance(s[i], int) and isinstance(s[j], int):
-                if i != j:
-                    if s[i] > 0 and s[j] > 0:
-                        if s[i] + s[j] == target:
-                            if s[i].is_integer() == 1 and s[j].is_integer() == 1:
-                                return [i, j]
+            return ERROR_TARGET
+    if size < 2:
+        return ERROR_LENGTH
+    return None
+
+
+def build_index(s):
+    """Индекс значение -> список позиций (в порядке возрастания)."""
+    index = {}
+    for i, value in enumerate(s):
+        index.setdefault(value, []).append(i)
+    return index
+
+
+def find_pair(s, index, target):
+    """
+    Поиск пары по готовому индексу за один проход.
+
+    Возвращает ту же пару [i, j], что и перебор двумя циклами:
+    минимальное i, а для него минимальное j != i.
+    """
+    for i, value in enumerate(s):
+        try:
+            need = target - value
+        except TypeError:  # целевая сумма не число (например, '6')
+            return NO_PAIR
+        positions = index.get(need)
+        if positions:
+            if positions[0] != i:
+                return [i, positions[0]]
+            if len(positions) > 1:
+                return [i, positions[1]]
+    return NO_PAIR
+
+
+def f(s, target):
+    error = check_target(target, len(s)) or check_numbers(s)
+    if error:
+        return error
+    return find_pair(s, build_index(s), target)
+
+
+def f_batch(s, targets):
+    """Ответы f для нескольких целевых сумм по одному общему индексу."""
+    numbers_error = check_numbers(s)
+    index = None
+    result = []
+    for target in targets:
+        error = check_target(target, len(s)) or numbers_error
+        if error:
+            result.append(error)
+            continue
+        if index is None:
+            index = build_index(s)
+        result.append(find_pair(s, index, target))
+    return result
+
+
+def f_numpy(s, target):
+    """
+    Вариант f для NumPy-массивов и объектов с буферным протоколом.
+
+    Массив не превращается в список. Значение и индекс упаковываются
+    в один ключ int64 (value << bits | index), и ключи сортируются одним
+    np.sort без argsort и выборки a[order]; внутри группы равных значений
+    индексы идут по возрастанию. Пары ищутся линейным слиянием двух
+    отсортированных массивов: значений верхней половины и target - v для
+    значений v <= target // 2. Если ключ не помещается в int64, массив
+    сортируется argsort, а первые индексы групп берутся reduceat.
+    Ответ совпадает с f.
+    """
+    import numpy as np
+
+    a = np.asarray(s)
+    error = check_target(target, len(a))
+    if error:
+        return error
+    if a.ndim != 1 or a.dtype.kind not in 'iu' or (a <= 0).any():
+        return ERROR_NUMBERS
+    try:
+        target = operator.index(target)
+    except TypeError:
+        if isinstance(target, float) and target.is_integer():
+            target = int(target)
+        else:
+            return NO_PAIR
+
+    top = int(a.max())
+    if top > 2 ** 62:  # сумма может не поместиться в int64
+        return f(a.tolist(), target)
+    n = len(a)
+    bits = n.bit_length()
+    grouped = top.bit_length() + bits <= 62
+    if grouped:
+        keys = np.left_shift(a, bits, dtype=np.int64)
+        keys |= np.arange(n, dtype=np.int64)
+        keys.sort()
+        values = keys >> bits
+
+        def positions(k):  # исходные индексы элементов k отсортированного массива
+            return keys[k] & ((1 << bits) - 1)
+    else:
+        order = np.argsort(a)
+        values = a[order].astype(np.int64, copy=False)
+
+        def positions(k):
+            return order[k]
+    if target > int(values[-1]) + int(values[-2]):
+        return NO_PAIR
+
+    # начала групп равных значений
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    uniq = values[starts]
+    if grouped:  # внутри группы индексы идут по возрастанию
+        def first_of(g):
+            return positions(starts[g])
+    else:
+        first = np.minimum.reduceat(order, starts)
+
+        def first_of(g):
+            return first[g]
+
+    # пара — это v <= target // 2 и w = target - v; возрастающие массивы
+    # w и значений верхней половины сливаются устойчивой сортировкой
+    # (она сливает готовые серии за линейное время), совпадения — пары
+    low = uniq[:np.searchsorted(uniq, target // 2, 'right')]
+    if not len(low):
+        return NO_PAIR
+    need = target - low[::-1]
+    high = uniq[np.searchsorted(uniq, need[0]):np.searchsorted(uniq, need[-1], 'right')]
+    merged = np.sort(np.concatenate((high, need)), kind='stable')
+    found = merged[1:][merged[1:] == merged[:-1]]
+    other = np.searchsorted(uniq, found)
+    own = np.searchsorted(uniq, target - found)
+    # v == w подходит, только если значение встречается дважды
+    same = own == other
+    if same.any():
+        second = np.minimum(starts[own[same]] + 1, n - 1)
+        keep = np.ones(len(own), dtype=bool)
+        keep[same] = values[second] == uniq[own[same]]
+        own, other = own[keep], other[keep]
+    if not len(own):
+        return NO_PAIR
+
+    # i — минимальный индекс среди обоих значений всех пар
+    groups = np.concatenate((own, other))
+    partners = np.concatenate((other, own))
+    firsts = first_of(groups)
+    k = np.argmin(firsts)
+    best, partner = groups[k], partners[k]
+    if partner != best:
+        return [int(firsts[k]), int(first_of(partner))]
+    if grouped:
+        return [int(firsts[k]), int(positions(starts[best] + 1))]
+    end = starts[best + 1] if best + 1 < len(starts) else n
+    return [int(firsts[k]), int(np.partition(order[starts[best]:end], 1)[1])]
+
+
+def _iter_pairs(values, index, target):
+    for i, value in enumerate(values):
+        if value is None:  # удалённый элемент TwoSumIndex
+            continue
+        try:
+            positions = index.get(target - value)
+        except TypeError:
+            return
+        if positions:
+            for k in range(bisect.bisect_right(positions, i), len(positions)):
+                yield i, positions[k]
+
+
+def _count_pairs(index, target):
+    count = 0
+    for value, positions in index.items():
+        try:
+            need = target - value
+        except TypeError:
+            return 0
+        if need == value:
+            count += len(positions) * (len(positions) - 1) // 2
+        elif value < need and need in index:
+            count += len(positions) * len(index[need])
+    return count
+
+
+def iter_pairs(s, target):
+    """
+    Лениво перечисляет все пары (i, j), i < j, с суммой target.
+
+    Пары идут в том же порядке, что и в переборе f (первая совпадает
+    с ответом f). Кроме индекса значение -> позиции память не расходуется.
+    """
+    error = check_target(target, len(s)) or check_numbers(s)
+    if error:
+        raise ValueError(error)
+    return _iter_pairs(s, build_index(s), target)
+
+
+def count_pairs(s, target):
+    """Количество пар из iter_pairs по кратностям значений, без перечисления."""
+    error = check_target(target, len(s)) or check_numbers(s)
+    if error:
+        raise ValueError(error)
+    return _count_pairs(build_index(s), target)
+
+
+def stream_pairs(items, target, window):
+    """
+    Потоковый вариант f для бесконечных итераторов.
+
+    Для каждого элемента j выдаёт пару (i, j), если среди последних window
+    событий (j - i < window) есть i с s[i] + s[j] == target; берётся самое
+    раннее такое i. Память — O(window) при любой длине потока.
+    """
+    if isinstance(target, int) and target <= 0:
+        raise ValueError(ERROR_TARGET)
+    if window < 2:
+        raise ValueError(ERROR_LENGTH)
+    return _stream_pairs(items, target, window)
+
+
+def _stream_pairs(items, target, window):
+    recent = deque()  # значения последних window - 1 событий
+    positions = {}  # значение -> позиции в окне (мультимножество)
+    for j, value in enumerate(items):
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(ERROR_NUMBERS)
+        try:
+            partners = positions.get(target - value)
+        except TypeError:
+            partners = None
+        if partners:
+            yield partners[0], j
+        recent.append(value)
+        positions.setdefault(value, deque()).append(j)
+        if len(recent) == window:
+            old = recent.popleft()
+            old_positions = positions[old]
+            old_positions.popleft()
+            if not old_positions:
+                del positions[old]
+
+
+def first_stream_pair(items, target, window):
+    """Первая пара из stream_pairs в виде [i, j] или сообщение, как у f."""
+    try:
+        pair = next(stream_pairs(items, target, window), None)
+    except ValueError as e:
+        return str(e)
+    return list(pair) if pair else NO_PAIR
+
+
+# Память на элемент при сортировке серии: массив значений, список индексов
+# и список ключей сортировки (целые Python), временный буфер слияния
+# в sorted и массив пар серии (замер tracemalloc — около 113 байт)
+RUN_ELEMENT_BYTES = 128
+# Память на пару в блоке чтения серии: массив пар и буфер fromfile
+MERGE_PAIR_BYTES = 32
+# Постоянная память одного читателя серии: файл, генераторы, место в heapq.merge
+MERGE_RUN_BYTES = 1536
+
+
+def _write_runs(path, directory, chunk_bytes):
+    """
+    Разбивает файл int64 (little-endian) на отсортированные серии.
+
+    Каждая серия — файл пар (значение, позиция) в порядке возрастания.
+    Возвращает список серий и признак ошибки данных.
+    """
+    runs = []
+    chunk = max(2, chunk_bytes // RUN_ELEMENT_BYTES)
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size % 8:
+            raise ValueError(f'Размер файла {path} не кратен 8 байтам')
+        if size == 0:
+            return runs, False
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            n = size // 8
+            for start in range(0, n, chunk):
+                values = array('q')
+                values.frombytes(buffer[start * 8:min(start + chunk, n) * 8])
+                if sys.byteorder == 'big':
+                    values.byteswap()
+                if min(values) <= 0:
+                    return runs, True
+                order = sorted(range(len(values)), key=values.__getitem__)
+                run = array('q')
+                for k in order:
+                    run.append(values[k])
+                    run.append(start + k)
+                del values, order
+                name = os.path.join(directory, f'run{len(runs)}')
+                with open(name, 'wb') as out:
+                    run.tofile(out)
+                runs.append((name, len(run) // 2))
+    return runs, False
+
+
+def _read_run(name, size, block, reverse=False):
+    """Читает серию блоками по block пар вперёд или назад."""
+    # без буфера: блоки и так читаются целиком, а серий может быть много
+    with open(name, 'rb', buffering=0) as file:
+        starts = range(0, size, block)
+        for start in (reversed(starts) if reverse else starts):
+            count = min(block, size - start)
+            file.seek(start * 16)
+            data = array('q')
+            data.fromfile(file, count * 2)
+            # пары берутся прямо из массива, без списка кортежей
+            items = reversed(data) if reverse else iter(data)
+            if reverse:
+                for position, value in zip(items, items):
+                    yield value, position
+            else:
+                yield from zip(items, items)
+
+
+def _groups(pairs):
+    """Группы равных значений: (значение, минимальная позиция, вторая, размер)."""
+    value = None
+    for current, position in pairs:
+        if current != value:
+            if value is not None:
+                yield value, first, second, count
+            value, first, second, count = current, position, None, 1
+            continue
+        count += 1
+        if position < first:
+            first, second = position, first
+        elif second is None or position < second:
+            second = position
+    if value is not None:
+        yield value, first, second, count
+
+
+def f_file(path, target, chunk_bytes=64 * 2 ** 20):
+    """
+    Вариант f для двоичного файла int64 (little-endian), который не
+    помещается в память.
+
+    Файл отображается через mmap и читается кусками по chunk_bytes:
+    каждый кусок сортируется и пишется во временную серию, затем серии
+    сливаются по возрастанию и по убыванию (два указателя). Размеры
+    серий и блоков слияния рассчитаны по RUN_ELEMENT_BYTES,
+    MERGE_PAIR_BYTES и MERGE_RUN_BYTES так, чтобы пиковая память Python
+    не превышала chunk_bytes (если chunk_bytes не слишком мал для числа
+    серий). Ответ совпадает с f.
+    """
+    error = check_target(target, os.path.getsize(path) // 8)
+    if error:
+        return error
+    with tempfile.TemporaryDirectory() as directory:
+        runs, invalid = _write_runs(path, directory, chunk_bytes)
+        if invalid:
+            return ERROR_NUMBERS
+        # блоки всех серий читаются одновременно в двух слияниях
+        share = chunk_bytes // (2 * max(1, len(runs))) - MERGE_RUN_BYTES
+        block = max(1, share // MERGE_PAIR_BYTES)
+        ascending = _groups(heapq.merge(*[_read_run(name, size, block) for name, size in runs]))
+        descending = _groups(heapq.merge(*[_read_run(name, size, block, True) for name, size in runs],
+                                         reverse=True))
+        best = None
+        low, high = next(ascending), next(descending)
+        while low[0] <= high[0]:
+            try:
+                total = low[0] + high[0]
+                if total == target:
+                    if low[0] == high[0]:
+                        if low[3] > 1:
+                            pair = [low[1], low[2]]
+                        else:
+                            break
+                    else:
+                        pair = sorted([low[1], high[1]])
+                    if best is None or pair[0] < best[0]:
+                        best = pair
+                if low[0] == high[0]:
+                    break
+                if total <= target:
+                    low = next(ascending)
+                if total >= target:
+                    high = next(descending)
+            except TypeError:  # целевая сумма не число
+                break
+        return best if best is not None else NO_PAIR
+
+
+def _run_job(s, target, shm_name=None, size=0):
+    """Выполняет одно задание в процессе-обработчике."""
+    started = time.perf_counter()
+    if shm_name is None:
+        result = f(s, target)
+    else:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            view = shm.buf[:size * 8].cast('q')
+            try:
+                result = f(view, target)
+            finally:
+                view.release()
+        finally:
+            shm.close()
+    return result, os.getpid(), time.perf_counter() - started
+
+
+def _to_shared(s):
+    """Кладёт список int64 в разделяемую память (None, если не подходит)."""
+    try:
+        data = array('q', s)
+    except (TypeError, OverflowError):  # нецелые или слишком большие числа
+        return None
+    if any(type(value) is not int for value in s):  # bool и т.п. — как в f
+        return None
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(data) * 8))
+    shm.buf[:len(data) * 8] = data.tobytes()
+    return shm
+
+
+def run_batch(jobs_path, results_path, workers=None, shm_threshold=10000):
+    """
+    Пакетный запуск f для заданий из JSONL-файла в пуле процессов.
+
+    Каждая строка jobs_path — объект {"s": [...], "target": ...}. Задания
+    читаются лениво (в работе не больше 4 * workers), большие списки
+    (от shm_threshold элементов) передаются через разделяемую память,
+    а не pickle. Результаты {"result": ...} пишутся в results_path
+    в порядке заданий; для строки, которая не разбирается как задание,
+    пишется {"error": ...}, и пакет продолжается. Возвращает статистику:
+    число заданий, заданий в секунду и загрузку каждого обработчика
+    (доля занятого времени).
+    """
+    workers = workers or os.cpu_count() or 1
+    # общий трекер до запуска пула, иначе обработчики заведут свои
+    # и при выходе попытаются удалить уже освобождённые блоки
+    resource_tracker.ensure_running()
+    started = time.perf_counter()
+    busy = {}
+    count = 0
+    pending = deque()
+
+    def write_first(out):
+        future, shm, error = pending.popleft()
+        if future is None:
+            out.write(json.dumps({'error': error}, ensure_ascii=False) + '\n')
+            return
+        try:
+            result, pid, elapsed = future.result()
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        busy[pid] = busy.get(pid, 0.0) + elapsed
+        out.write(json.dumps({'result': result}, ensure_ascii=False) + '\n')
+
+    with open(jobs_path, encoding='utf-8') as jobs, \
+            open(results_path, 'w', encoding='utf-8') as out, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for line in jobs:
+                if not line.strip():
+                    continue
+                count += 1
+                try:
+                    job = json.loads(line)
+                    s, target = job['s'], job['target']
+                    size = len(s)
+                except (ValueError, KeyError, TypeError) as e:
+                    pending.append((None, None, f'{ERROR_JOB}: {e!r}'))
+                else:
+                    shm = _to_shared(s) if size >= shm_threshold else None
+                    if shm is None:
+                        future = pool.submit(_run_job, s, target)
                     else:
-                        return 'Введите только целые положительные числа'
+                        future = pool.submit(_run_job, None, target, shm.name, size)
+                    pending.append((future, shm, None))
+                if len(pending) >= 4 * workers:
+                    write_first(out)
+            while pending:
+                write_first(out)
+        finally:
+            # при ошибке освобождаем разделяемую память всех оставшихся заданий
+            for future, shm, _ in pending:
+                if future is not None:
+                    future.cancel()
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+
+    wall = time.perf_counter() - started
+    return {
+        'jobs': count,
+        'seconds': wall,
+        'jobs_per_second': count / wall if wall else 0.0,
+        'utilisation': {pid: seconds / wall for pid, seconds in busy.items()} if wall else {},
+    }
+
+
+class TwoSumIndex:
+    """
+    Индекс для многократных запросов f по одному и тому же списку.
+
+    Строится один раз: словарь значение -> позиции и наименьшее и наибольшее
+    значения (для быстрого отсева недостижимых сумм). Позиции стабильны: add добавляет элемент в конец,
+    remove удаляет элемент по позиции, не сдвигая остальные.
+    Ответы на запросы кешируются до следующего изменения.
+    """
+
+    def __init__(self, s):
+        started = time.perf_counter()
+        error = check_numbers(s)
+        if error:
+            raise ValueError(error)
+        self._index = build_index(s)
+        self._bounds()
+        self._values = list(s)  # позиция -> значение (None — удалён)
+        self._size = len(s)
+        self._cache = {}
+        self.build_time = time.perf_counter() - started
+
+    def _bounds(self):
+        self._low = min(self._index, default=None)
+        self._high = max(self._index, default=None)
+
+    def __len__(self):
+        return self._size
+
+    def query(self, target):
+        """Та же пара [i, j] (или сообщение), что и f для текущего списка."""
+        error = check_target(target, self._size)
+        if error:
+            return error
+        try:
+            return self._cache[target]
+        except TypeError:  # нехешируемая целевая сумма
+            return NO_PAIR
+        except KeyError:
+            pass
+        result = self._search(target)
+        self._cache[target] = result
+        return result
+
+    def _search(self, target):
+        try:
+            if target < 2 * self._low or target > 2 * self._high:
+                return NO_PAIR
+        except TypeError:
+            return NO_PAIR
+        best = None
+        for value, positions in self._index.items():
+            if best is not None and positions[0] > best[0]:
+                continue
+            others = self._index.get(target - value)
+            if others is None:
+                continue
+            if others is positions:
+                if len(positions) < 2:
+                    continue
+                pair = [positions[0], positions[1]]
             else:
-                return 'Введите только целые положительные числа'
-    return 'Нет подходящей пары для достижения целевой суммы'
+                pair = [positions[0], others[0]]
+            if best is None or pair[0] < best[0]:
+                best = pair
+        return best if best is not None else NO_PAIR
+
+    def pairs(self, target):
+        """Все пары (i, j), i < j, для текущего списка (см. iter_pairs)."""
+        error = check_target(target, self._size)
+        if error:
+            raise ValueError(error)
+        return _iter_pairs(self._values, self._index, target)
+
+    def count_pairs(self, target):
+        """Количество пар без перечисления (см. count_pairs)."""
+        error = check_target(target, self._size)
+        if error:
+            raise ValueError(error)
+        return _count_pairs(self._index, target)
+
+    def add(self, value):
+        """Добавляет число в конец списка и возвращает его позицию."""
+        if check_numbers([value]):
+            raise ValueError(ERROR_NUMBERS)
+        position = len(self._values)
+        self._values.append(value)
+        self._size += 1
+        if value in self._index:
+            self._index[value].append(position)
+        else:
+            self._index[value] = [position]
+            if self._low is None or value < self._low:
+                self._low = value
+            if self._high is None or value > self._high:
+                self._high = value
+        self._cache.clear()
+        return position
+
+    def remove(self, position):
+        """Удаляет элемент с позицией position."""
+        value = self._values[position] if 0 <= position < len(self._values) else None
+        if value is None:
+            raise KeyError(position)
+        self._values[position] = None
+        positions = self._index[value]
+        k = bisect.bisect_left(positions, position)
+        del positions[k]
+        if not positions:
+            del self._index[value]
+            if value == self._low or value == self._high:
+                self._bounds()
+        self._size -= 1
+        self._cache.clear()
+
+    def memory_size(self):
+        """Приблизительный объём памяти индекса в байтах."""
+        size = sys.getsizeof(self._index) + sys.getsizeof(self._values)
+        for value, positions in self._index.items():
+            size += sys.getsizeof(value) + sys.getsizeof(positions)
+        return size
+
+    def stats(self):
+        """Время построения (с), объём памяти (байт) и размер индекса."""
+        return {
+            'build_time': self.build_time,
+            'memory': self.memory_size(),
+            'size': self._size,
+            'unique': len(self._index),
+        }
+
+
 print(f([3, 3, 3, 3], '6'))
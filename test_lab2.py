@@ -1,5 +1,13 @@
 from Python import lab2
+from array import array
+import io
+import os
+import tempfile
 import unittest
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestMySolution(unittest.TestCase):
@@ -34,6 +42,130 @@ class TestMySolution(unittest.TestCase):
         """Тест отрицательного числа."""
         self.assertEqual(lab2.guess_number(-10, list(range(1, 100)), '2'), 'Число не найдено')
 
+    def test_range_binary(self):
+        """Тест бинарного поиска по range без построения списка."""
+        self.assertEqual(lab2.guess_number(78, range(1, 101), '2'),
+                         'Угадываемое число: 78, количество попыток: 5')
+
+    def test_range_linear(self):
+        """Тест линейного поиска по range: попытки вычисляются без перебора."""
+        self.assertEqual(lab2.guess_number(987654321, range(1, 10 ** 9 + 1), '1'),
+                         'Угадываемое число: 987654321, количество попыток: 987654321')
+
+    def test_range_not_found(self):
+        """Тест отсутствующего числа в range."""
+        self.assertEqual(lab2.guess_number(105, range(1, 101), '2'), 'Число не найдено')
+
+    def test_sorted_with_duplicates(self):
+        """Тест уже отсортированного списка с повторами: список не сортируется."""
+        s = [1, 2, 2, 2, 2, 2, 3]
+        for m in ('1', '2'):
+            self.assertEqual(lab2.guess_number(2, s, m, is_sorted=True), lab2.guess_number(2, list(s), m))
+
+    @unittest.skipIf(numpy is None, 'numpy не установлен')
+    def test_batch_binary(self):
+        """Тест пакетного бинарного поиска: флаги и попытки как у guess_number."""
+        found, attempts = lab2.guess_batch([78, 1, 105], list(range(100, 0, -1)), '2')
+        self.assertEqual(found.tolist(), [True, True, False])
+        self.assertEqual(attempts[:2].tolist(), [5, 6])
+        self.assertEqual(lab2.guess_number(1, list(range(1, 101)), '2'),
+                         'Угадываемое число: 1, количество попыток: 6')
+
+    @unittest.skipIf(numpy is None, 'numpy не установлен')
+    def test_batch_linear(self):
+        """Тест пакетного линейного поиска: ненайденное число стоит n попыток."""
+        found, attempts = lab2.guess_batch([78, 105], range(1, 101), '1')
+        self.assertEqual(found.tolist(), [True, False])
+        self.assertEqual(attempts.tolist(), [78, 100])
+
+    def test_interpolation(self):
+        """Тест интерполяционного поиска: на равномерных данных одна попытка."""
+        self.assertEqual(lab2.guess_number(78, list(range(1, 101)), '3'),
+                         'Угадываемое число: 78, количество попыток: 1')
+        self.assertEqual(lab2.guess_number(105, list(range(1, 101)), '3'), 'Число не найдено')
+
+    def test_exponential(self):
+        """Тест экспоненциального поиска: число рядом с началом находится быстро."""
+        self.assertEqual(lab2.guess_number(5, range(1, 10 ** 9 + 1), '4'),
+                         'Угадываемое число: 5, количество попыток: 4')
+        self.assertEqual(lab2.guess_number(78, [100 - i for i in range(100)], '4'),
+                         'Угадываемое число: 78, количество попыток: 11')
+        self.assertEqual(lab2.guess_number(0, list(range(1, 101)), '4'), 'Число не найдено')
+
+    def test_compare_modes(self):
+        """Тест отчёта о среднем количестве попыток."""
+        report = lab2.compare_modes(n=100, trials=50, distributions={'range': lambda rng, n: list(range(n))})
+        self.assertEqual(list(report), ['range'])
+        self.assertEqual(report['range']['3'], 1.0)
+        self.assertLess(report['range']['2'], report['range']['1'])
+
+    def test_batch_mode(self):
+        """Тест пакетного режима: по строке на запрос, ошибки не прерывают работу."""
+        lines = ['2 78 1 100\n', '\n', '# комментарий\n', '1 78 1 100\n', '5 78 1 100\n',
+                 '2 x 1 100\n', '2 5 10 1\n', '2 105 1 100\n']
+        out = io.StringIO()
+        stats = lab2.run_batch(lines, out)
+        self.assertEqual(out.getvalue().splitlines(), [
+            'Угадываемое число: 78, количество попыток: 5',
+            'Угадываемое число: 78, количество попыток: 78',
+            'Введите только 1, 2, 3 или 4',
+            'Введите целочисленное значение',
+            'Первое число должно быть меньше второго',
+            'Число не найдено',
+        ])
+        self.assertEqual(stats['queries'], 6)
+
+    def test_file_search(self):
+        """Тест поиска в отсортированном файле int64 через mmap."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.bin')
+            with open(path, 'wb') as file:
+                array('q', range(1, 101)).tofile(file)
+            for m in ('1', '2', '3', '4'):
+                self.assertEqual(lab2.guess_in_file(78, path, m), lab2.guess_number(78, list(range(1, 101)), m))
+            self.assertEqual(lab2.guess_in_file(105, path), 'Число не найдено')
+
+    def test_file_probe_cache(self):
+        """Тест кеша верхних уровней: повторные поиски не читают эти пробы из файла."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.bin')
+            with open(path, 'wb') as file:
+                array('q', range(1, 101)).tofile(file)
+            with lab2.SortedInt64File(path, cache_levels=3) as s:
+                self.assertEqual(lab2.guess_number(78, s, '2', is_sorted=True),
+                                 'Угадываемое число: 78, количество попыток: 5')
+                self.assertEqual((s.hits, s.misses), (3, 2))
+
+    def test_attempt_distribution(self):
+        """Тест аналитического распределения попыток против перебора всех чисел."""
+        for n in range(1, 40):
+            for m in ('1', '2'):
+                attempts = [int(lab2.guess_number(x, list(range(1, n + 1)), m).split()[-1])
+                            for x in range(1, n + 1)]
+                histogram = {k: attempts.count(k) for k in set(attempts)}
+                result = lab2.attempt_distribution(1, n, m)
+                self.assertEqual({k: count for first, last, count in result['histogram']
+                                  for k in range(first, last + 1)}, histogram)
+                self.assertEqual((result['min'], result['max']), (min(attempts), max(attempts)))
+                self.assertAlmostEqual(result['mean'], sum(attempts) / n)
+
+    def test_attempt_distribution_large(self):
+        """Тест большого диапазона и гистограммы по интервалам."""
+        result = lab2.attempt_distribution(1, 10 ** 12, '2', bins=4)
+        self.assertEqual(result['max'], 40)
+        self.assertEqual(sum(result['bins']), 10 ** 12)
+        self.assertEqual(sum(count for _, _, count in result['histogram']), 10 ** 12)
+        self.assertEqual(lab2.attempt_distribution(1, 100, '1', bins=4)['bins'], [25, 25, 25, 25])
+        self.assertEqual(lab2.attempt_distribution(5, 4, '2'), {'count': 0, 'min': 0, 'max': 0, 'mean': 0.0,
+                                                                'histogram': [], 'bins': []})
+
+    def test_attempt_distribution_large_linear(self):
+        """Тест линейного перебора на большом диапазоне без гистограммы по числам."""
+        result = lab2.attempt_distribution(1, 10 ** 12, '1')
+        self.assertEqual(result['histogram'], [(1, 10 ** 12, 1)])
+        self.assertEqual((result['min'], result['max']), (1, 10 ** 12))
+        self.assertAlmostEqual(result['mean'], (10 ** 12 + 1) / 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,17 @@
+import io
+import json
+import os
+import tempfile
 import unittest
-from lab3 import gen_bin_tree, left_branch, right_branch
+from itertools import islice
+from lab3 import (HeapLayout, SubtreeCache, TreeFile, TreeGrower, affine_coefficients, find_value, gen_bin_tree,
+                  gen_bin_tree_compact, gen_bin_tree_lazy, gen_bin_tree_memo, gen_bin_tree_numpy, gen_bin_tree_parallel,
+                  iter_tree, left_branch, level_values, node_value, right_branch, save_heap, tree_stats, write_tree,
+                  write_tree_file)
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestGenBinTreeSimple(unittest.TestCase):
@@ -48,6 +60,252 @@ class TestGenBinTreeSimple(unittest.TestCase):
         for child in tree["1"]:
             self.assertEqual(len(child[list(child.keys())[0]]), 2)
 
+    def test_compact_matches_dict(self):
+        """Компактное дерево переводится в тот же словарь, что и gen_bin_tree"""
+        for height in range(5):
+            self.assertEqual(gen_bin_tree_compact(height, 15).to_dict(), gen_bin_tree(height, 15))
+
+    def test_compact_navigation(self):
+        """Индексы потомков, родителя и уровня в кучевой раскладке"""
+        tree = gen_bin_tree_compact(height=2, root=10)
+        self.assertEqual(len(tree), 7)
+        self.assertEqual(tree.value(tree.left(0)), 22)
+        self.assertEqual(tree.value(tree.right(0)), 18)
+        self.assertEqual(tree.parent(5), 2)
+        self.assertEqual(tree.level(5), 2)
+        self.assertIsNone(tree.left(3))
+        self.assertEqual(list(tree.level_values(1)), [22, 18])
+
+    def test_compact_big_values(self):
+        """Значения больше int64 хранятся без переполнения"""
+        tree = gen_bin_tree_compact(height=3, root=2 ** 62)
+        self.assertEqual(tree.to_dict(), gen_bin_tree(height=3, root=2 ** 62))
+
+    @unittest.skipIf(numpy is None, "numpy не установлен")
+    def test_numpy_matches_dict(self):
+        """Векторное построение по уровням даёт то же дерево"""
+        for height in range(5):
+            self.assertEqual(gen_bin_tree_numpy(height, 15).to_dict(), gen_bin_tree(height, 15))
+
+    @unittest.skipIf(numpy is None, "numpy не установлен")
+    def test_numpy_overflow_fallback(self):
+        """При выходе за int64 значения считаются в целых числах Python"""
+        tree = gen_bin_tree_numpy(height=4, root=2 ** 60)
+        self.assertEqual(tree.values.dtype, object)
+        self.assertEqual(tree.to_dict(), gen_bin_tree(height=4, root=2 ** 60))
+        tree = gen_bin_tree_numpy(height=3, root=3, l_b=lambda x: x * 10 ** 9, r_b=lambda x: x - 1)
+        self.assertEqual(tree.to_dict(), gen_bin_tree(3, 3, lambda x: x * 10 ** 9, lambda x: x - 1))
+
+    def test_lazy_matches_dict(self):
+        """Ленивое дерево переводится в тот же словарь"""
+        for height in range(5):
+            self.assertEqual(gen_bin_tree_lazy(height, 15, cache_size=3).to_dict(), gen_bin_tree(height, 15))
+
+    def test_lazy_tall_tree(self):
+        """В дереве высотой 40 вычисляются только узлы на пути"""
+        tree = gen_bin_tree_lazy(height=40, root=15)
+        node = tree.index([0] * 40)
+        self.assertEqual(tree.level(node), 40)
+        self.assertEqual(tree.value(node), 17 * 2 ** 40 - 2)
+        self.assertEqual(tree.value(tree.parent(node)), 17 * 2 ** 39 - 2)
+        self.assertEqual(tree.cached(), 40)
+        self.assertIsNone(tree.left(node))
+
+    def test_affine_detection(self):
+        """Коэффициенты аффинных ветвей определяются, остальные — нет"""
+        self.assertEqual(affine_coefficients(left_branch), (2, 2))
+        self.assertEqual(affine_coefficients(right_branch), (2, -2))
+        self.assertIsNone(affine_coefficients(lambda x: x * x))
+
+    def test_closed_form_matches_tree(self):
+        """Значения узлов и уровней по формуле совпадают с построенным деревом"""
+        branches = [(left_branch, right_branch), (lambda x: 3 * x + 1, lambda x: 3 * x - 1),
+                    (lambda x: x + 100, lambda x: x - 2), (lambda x: x * x, lambda x: x + 1)]
+        for l_b, r_b in branches:
+            tree = gen_bin_tree_compact(4, 5, l_b, r_b)
+            for level in range(5):
+                for detect in (False, True):
+                    self.assertEqual(list(level_values(level, 5, l_b, r_b, detect=detect)),
+                                     list(tree.level_values(level)))
+                    for index in range(2 ** level):
+                        self.assertEqual(node_value(level, index, 5, l_b, r_b, detect=detect),
+                                         tree.value(2 ** level - 1 + index))
+
+    def test_affine_not_guessed(self):
+        """Ветвь, аффинная во всех пробных точках, кроме одной, не считается по формуле"""
+        r_b = lambda x: 99 if x == 17 else 2 * (x - 1)
+        self.assertEqual(tree_stats(1, 17, left_branch, r_b)['sum'], 17 + 36 + 99)
+        self.assertEqual(list(level_values(1, 17, left_branch, r_b)), [36, 99])
+        self.assertEqual(node_value(1, 1, 17, left_branch, r_b), 99)
+
+    def test_closed_form_tall_level(self):
+        """Уровень 60 возвращается как range без построения дерева"""
+        level = level_values(60, 15)
+        self.assertIsInstance(level, range)
+        self.assertEqual(len(level), 2 ** 60)
+        self.assertEqual(level[0], 17 * 2 ** 60 - 2)
+        self.assertEqual(node_value(60, 2 ** 60 - 1, 15), 13 * 2 ** 60 + 2)
+
+    def test_tree_stats(self):
+        """Статистика по формулам совпадает с потоковым подсчётом и деревом"""
+        stats = tree_stats(height=3, root=5)
+        tree = gen_bin_tree_compact(height=3, root=5)
+        self.assertEqual(stats, tree_stats(height=3, root=5, detect=False))
+        self.assertEqual(stats['sum'], sum(tree.values))
+        self.assertEqual((stats['min'], stats['max']), (min(tree.values), max(tree.values)))
+        self.assertEqual((stats['nodes'], stats['leaves']), (15, 8))
+        self.assertEqual(stats['levels'][1], {'level': 1, 'count': 2, 'sum': 20, 'min': 8, 'max': 12})
+
+    def test_tree_stats_tall(self):
+        """Дерево высотой 40 не строится"""
+        stats = tree_stats(height=40)
+        self.assertEqual(stats['leaves'], 2 ** 40)
+        self.assertEqual(stats['levels'][40]['max'], 17 * 2 ** 40 - 2)
+
+    def test_find_value(self):
+        """Поиск значения по уровням"""
+        self.assertEqual(list(find_value(58, 4, root=15)), [(2, 2)])
+        self.assertEqual(list(find_value(58, 4, root=15, detect=False)), [(2, 2)])
+        self.assertEqual(list(find_value(59, 4, root=15)), [])
+        self.assertEqual(list(find_value(node_value(35, 12345, 15), 36, 15)), [(35, 12345)])
+
+    def test_memo_matches_dict(self):
+        """Дерево с кешем поддеревьев совпадает с обычным"""
+        for height in range(5):
+            self.assertEqual(gen_bin_tree_memo(height, 15), gen_bin_tree(height, 15))
+            self.assertEqual(gen_bin_tree_memo(height, 15, cache=SubtreeCache(maxsize=2)), gen_bin_tree(height, 15))
+
+    def test_memo_shares_subtrees(self):
+        """Одинаковые поддеревья строятся один раз и в режиме share общие"""
+        cache = SubtreeCache()
+        tree = gen_bin_tree_memo(2, 0, lambda x: x + 1, lambda x: x - 1, cache=cache, share=True)
+        left, right = tree["0"]
+        self.assertIs(left["1"][1], right["-1"][0])  # оба — поддерево {"0": []}
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 6, 6))
+        copied = gen_bin_tree_memo(2, 0, lambda x: x + 1, lambda x: x - 1)
+        self.assertIsNot(copied["0"][0]["1"][1], copied["0"][1]["-1"][0])
+
+    def test_memo_tall_dag(self):
+        """Граф высотой 200 строится, потому что значений на уровне мало"""
+        cache = SubtreeCache()
+        gen_bin_tree_memo(200, 0, lambda x: x + 1, lambda x: x - 1, cache=cache, share=True)
+        self.assertEqual(cache.misses, 201 * 202 // 2)
+
+    def test_grow_dict_tree(self):
+        """Наращивание дерева-словаря на k уровней"""
+        grower = TreeGrower(gen_bin_tree(height=2, root=15))
+        self.assertEqual(grower.grow(1), gen_bin_tree(height=3, root=15))
+        self.assertEqual(grower.grow(2), gen_bin_tree(height=5, root=15))
+        self.assertEqual(grower.levels, 6)
+
+    def test_extend_compact_tree(self):
+        """Наращивание компактного дерева дописывает только новые узлы"""
+        tree = gen_bin_tree_compact(height=2, root=5, l_b=lambda x: x + 100, r_b=lambda x: x - 2)
+        values = tree.values
+        tree.extend(2)
+        self.assertIs(tree.values, values)
+        self.assertEqual(tree.height, 4)
+        self.assertEqual(tree.to_dict(), gen_bin_tree(4, 5, lambda x: x + 100, lambda x: x - 2))
+
+    def test_heap_layout_abstract(self):
+        """Подкласс без value не создаётся"""
+        class Incomplete(HeapLayout):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_parallel_matches_dict(self):
+        """Параллельное построение с разрезом на разной глубине"""
+        for split in (1, 2):
+            tree = gen_bin_tree_parallel(height=4, root=15, split=split, workers=2)
+            self.assertEqual(tree.to_dict(), gen_bin_tree(height=4, root=15))
+            self.assertEqual(gen_bin_tree_parallel(4, 15, split=split, workers=2, form="dict"),
+                             gen_bin_tree(height=4, root=15))
+
+    def test_parallel_no_split(self):
+        """Разрез на глубине 0 и меньше — последовательное построение"""
+        for split in (0, -1):
+            self.assertEqual(gen_bin_tree_parallel(height=3, split=split, workers=1).to_dict(), gen_bin_tree(height=3))
+            self.assertEqual(gen_bin_tree_parallel(3, split=split, workers=1, form="dict"), gen_bin_tree(height=3))
+
+    def test_parallel_zero_copy_join(self):
+        """Поддеревья компактной формы используются без копирования"""
+        tree = gen_bin_tree_parallel(height=3, root=15, split=1, workers=2)
+        self.assertEqual(len(tree.subtrees), 2)
+        self.assertEqual(tree.value(len(tree) - 1), tree.subtrees[1].value(6))
+        self.assertEqual(tree.to_heap().to_dict(), gen_bin_tree(height=3, root=15))
+
+    def test_write_json(self):
+        """Потоковый JSON совпадает с json.dumps словаря"""
+        for height in range(4):
+            out = io.StringIO()
+            write_tree(out, height=height, root=15, buffer_size=8)
+            self.assertEqual(out.getvalue(), json.dumps(gen_bin_tree(height=height, root=15)))
+
+    def test_write_ndjson(self):
+        """NDJSON: строка на узел, в двоичный файл"""
+        out = io.BytesIO()
+        write_tree(out, height=1, root=10, fmt="ndjson")
+        rows = [json.loads(line) for line in out.getvalue().decode().splitlines()]
+        self.assertEqual(rows, [{"id": 0, "parent": None, "level": 0, "value": 10},
+                                {"id": 1, "parent": 0, "level": 1, "value": 22},
+                                {"id": 2, "parent": 0, "level": 1, "value": 18}])
+
+    def test_tree_file(self):
+        """Дерево в файле: навигация и восстановление ветвей"""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "tree.bin")
+            self.assertEqual(write_tree_file(path, height=4, root=15, chunk=2), 31)
+            with TreeFile(path) as tree:
+                self.assertEqual(tree.to_dict(), gen_bin_tree(height=4, root=15))
+                self.assertEqual(tree.value(tree.right(tree.left(0))), 62)
+                self.assertEqual(tree.level_values(2), [66, 62, 58, 54])
+                self.assertEqual((tree.root, tree.l_b(1), tree.r_b(1)), (15, 4, 0))
+
+    def test_tree_file_no_guess(self):
+        """Неаффинная ветвь записывается вызовами, а не по формуле"""
+        r_b = lambda x: 99 if x == 17 else 2 * (x - 1)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "tree.bin")
+            write_tree_file(path, height=1, root=17, l_b=left_branch, r_b=r_b)
+            with TreeFile(path) as tree:
+                self.assertEqual(tree.to_dict(), {"17": [{"36": []}, {"99": []}]})
+
+    def test_tree_file_big_values(self):
+        """Числа вне int64 хранятся в отдельном разделе"""
+        square = lambda x: x * x
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "tree.bin")
+            save_heap(path, 4, 3 ** 30, square, right_branch, chunk=1)
+            with TreeFile(path) as tree:
+                self.assertEqual(tree.to_dict(), gen_bin_tree(3, 3 ** 30, square, right_branch))
+                self.assertIsNone(tree.r_b)
+            with TreeFile(path, import_branches=True) as tree:
+                self.assertIsNone(tree.l_b)
+                self.assertEqual(tree.r_b, right_branch)
+            save_heap(path, 0)
+            with TreeFile(path) as tree:
+                self.assertEqual((len(tree), tree.to_dict()), (0, {}))
+
+    def test_iter_tree_orders(self):
+        """Порядки обхода без построения дерева"""
+        self.assertEqual(list(iter_tree(height=1, root=10)),
+                         [(0, (), 10), (1, (0,), 22), (1, (1,), 18)])
+        self.assertEqual([value for _, _, value in iter_tree(height=1, root=10, order="in")], [22, 10, 18])
+        self.assertEqual([value for _, _, value in iter_tree(height=1, root=10, order="post")], [22, 18, 10])
+        tree = gen_bin_tree_compact(height=3, root=15)
+        self.assertEqual([value for _, _, value in iter_tree(height=3, root=15, order="bfs")],
+                         [tree.value(i) for i in range(len(tree))])
+        with self.assertRaises(ValueError):
+            list(iter_tree(order="zigzag"))
+
+    def test_iter_tree_deep(self):
+        """Глубокое дерево без RecursionError: обход прерывается рано"""
+        path = islice(iter_tree(height=10000, root=0, l_b=lambda x: x + 1, r_b=lambda x: x - 1), 5000)
+        depth, steps, value = list(path)[-1]
+        self.assertEqual((depth, len(steps), value), (4999, 4999, 4999))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,18 @@
 from Python import ni1
+from array import array
+import itertools
+import json
+import os
+import random
+import tempfile
+import tracemalloc
 import unittest
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
 class TestMySolution(unittest.TestCase):
     def test_1(self):
         self.assertEqual(ni1.f([3, 3, 3, 3], 6), [0, 1])
@@ -55,5 +68,162 @@ class TestMySolution(unittest.TestCase):
     def test_18(self):
         self.assertEqual(ni1.f([3, 3, 3, 3], '18'), 'Нет подходящей пары для достижения целевой суммы')
 
+    def test_19(self):
+        self.assertEqual(ni1.f([2, 1, 5, 4], 6), [0, 3])
+
+    def test_20(self):
+        self.assertEqual(ni1.f_batch([3, 6, 7, 4, 2, 1, 1, 9], [4, 2, 100, -1]),
+                         [[0, 5], [5, 6], 'Нет подходящей пары для достижения целевой суммы',
+                          'Значение целевой суммы должно быть больше нуля'])
+
+    def test_21(self):
+        self.assertEqual(ni1.f_batch([3, -3], [6, 0]),
+                         ['Введите только целые положительные числа',
+                          'Значение целевой суммы должно быть больше нуля'])
+
+    def test_22(self):
+        s = list(range(1, 100001))
+        self.assertEqual(ni1.f(s, 199999), [99998, 99999])
+
+    @unittest.skipIf(numpy is None, 'numpy не установлен')
+    def test_23(self):
+        s = [3, 6, 7, 4, 2, 1, 1, 9]
+        for target in (4, 2, 12, 100):
+            self.assertEqual(ni1.f_numpy(numpy.array(s), target), ni1.f(s, target))
+        big = [2 ** 60 + 5, 7, 2 ** 60 + 5, 2 ** 60 - 2, 9]  # ключ значение-индекс не помещается в int64
+        for target in (2 ** 61 + 10, 2 ** 60 + 7, 16, 3):
+            self.assertEqual(ni1.f_numpy(numpy.array(big), target), ni1.f(big, target))
+
+    @unittest.skipIf(numpy is None, 'numpy не установлен')
+    def test_24(self):
+        self.assertEqual(ni1.f_numpy(numpy.array([3, 0, 3]), 6), 'Введите только целые положительные числа')
+        self.assertEqual(ni1.f_numpy(numpy.array([3.0, 3.0]), 6), 'Введите только целые положительные числа')
+        self.assertEqual(ni1.f_numpy(numpy.array([3, 3]), -6), 'Значение целевой суммы должно быть больше нуля')
+
+    def test_25(self):
+        index = ni1.TwoSumIndex([3, 6, 7, 4, 2, 1, 1, 9])
+        self.assertEqual(index.query(4), [0, 5])
+        self.assertEqual(index.query(4), ni1.f([3, 6, 7, 4, 2, 1, 1, 9], 4))
+        self.assertEqual(index.query(0), 'Значение целевой суммы должно быть больше нуля')
+        self.assertEqual(index.query(100), 'Нет подходящей пары для достижения целевой суммы')
+
+    def test_26(self):
+        index = ni1.TwoSumIndex([3, 6])
+        self.assertEqual(index.add(1), 2)
+        self.assertEqual(index.query(4), [0, 2])
+        index.remove(0)
+        self.assertEqual(index.query(4), 'Нет подходящей пары для достижения целевой суммы')
+        self.assertEqual(index.query(7), [1, 2])
+        index.remove(1)
+        self.assertEqual(index.query(7), 'Введите минимум два целых положительных числа')
+        self.assertRaises(KeyError, index.remove, 1)
+        self.assertRaises(ValueError, index.add, -1)
+        index = ni1.TwoSumIndex([1, 5, 9, 2 ** 70])
+        index.remove(3)
+        index.remove(0)
+        self.assertEqual(index.query(14), [1, 2])
+        self.assertEqual(index.query(19), 'Нет подходящей пары для достижения целевой суммы')
+        self.assertEqual(index.add(2 ** 70 - 5), 4)
+        self.assertEqual(index.query(2 ** 70), [1, 4])
+
+    def test_27(self):
+        self.assertRaises(ValueError, ni1.TwoSumIndex, [3, 'a'])
+        stats = ni1.TwoSumIndex([1, 2, 2]).stats()
+        self.assertEqual((stats['size'], stats['unique']), (3, 2))
+        self.assertGreater(stats['memory'], 0)
+
+    def test_28(self):
+        self.assertEqual(list(ni1.iter_pairs([3, 3, 3, 3], 6)),
+                         [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)])
+        self.assertEqual(list(ni1.iter_pairs([1, 2, 3, 4], 78)), [])
+        self.assertRaises(ValueError, ni1.iter_pairs, [3, -3], 6)
+
+    def test_29(self):
+        self.assertEqual(ni1.count_pairs([3, 3, 3, 3], 6), 6)
+        self.assertEqual(ni1.count_pairs([3, 6, 7, 4, 2, 1, 1, 9], 4), 2)
+        self.assertEqual(ni1.count_pairs([3] * 100000, 6), 4999950000)
+        self.assertEqual(ni1.TwoSumIndex([1, 3, 3, 1]).count_pairs(4), 4)
+
+    def test_30(self):
+        self.assertEqual(list(ni1.stream_pairs([1, 5, 2, 3, 4, 1], 5, 3)), [(2, 3), (4, 5)])
+        self.assertEqual(list(ni1.stream_pairs([1, 5, 2, 3, 4, 1], 5, 5)), [(2, 3), (0, 4), (4, 5)])
+
+    def test_31(self):
+        self.assertEqual(ni1.first_stream_pair(itertools.count(1), 19, 10), [8, 9])
+        self.assertEqual(ni1.first_stream_pair([4, 1, 1, 4], 8, 3), 'Нет подходящей пары для достижения целевой суммы')
+        self.assertEqual(ni1.first_stream_pair([3, 'a', 3], 6, 3), 'Введите только целые положительные числа')
+        self.assertEqual(ni1.first_stream_pair([3, 3], -6, 3), 'Значение целевой суммы должно быть больше нуля')
+
+    def test_32(self):
+        s = [3, 6, 7, 4, 2, 1, 1, 9, 5, 5]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with open(path, 'wb') as file:
+                array('q', s).tofile(file)
+            for target in (4, 2, 10, 18, 100, 0, '6'):
+                self.assertEqual(ni1.f_file(path, target, chunk_bytes=64 * 3), ni1.f(s, target))
+
+    def test_33(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with open(path, 'wb') as file:
+                array('q', [3, -3, 3]).tofile(file)
+            self.assertEqual(ni1.f_file(path, 6), 'Введите только целые положительные числа')
+            open(path, 'wb').close()
+            self.assertEqual(ni1.f_file(path, 6), 'Введите минимум два целых положительных числа')
+
+    def test_33_memory(self):
+        rng = random.Random(3)
+        chunk_bytes = 256 * 1024
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with open(path, 'wb') as file:
+                array('q', [rng.randint(1, 10 ** 12) for _ in range(100000)]).tofile(file)
+            tracemalloc.start()
+            try:
+                ni1.f_file(path, 5, chunk_bytes=chunk_bytes)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        self.assertLessEqual(peak, chunk_bytes)
+
+    def test_34(self):
+        jobs = [{'s': [3, 3, 3, 3], 'target': 6}, {'s': [3, 'a'], 'target': 6},
+                {'s': [3, 6, 7, 4, 2, 1, 1, 9], 'target': 4}, {'s': [1], 'target': 2},
+                {'s': [1, 2, 3, 4], 'target': 78}]
+        with tempfile.TemporaryDirectory() as directory:
+            jobs_path = os.path.join(directory, 'jobs.jsonl')
+            results_path = os.path.join(directory, 'results.jsonl')
+            with open(jobs_path, 'w', encoding='utf-8') as file:
+                file.writelines(json.dumps(job) + '\n' for job in jobs)
+            stats = ni1.run_batch(jobs_path, results_path, workers=2, shm_threshold=3)
+            with open(results_path, encoding='utf-8') as file:
+                results = [json.loads(line)['result'] for line in file]
+        self.assertEqual(results, [ni1.f(job['s'], job['target']) for job in jobs])
+        self.assertEqual(stats['jobs'], 5)
+        self.assertGreater(stats['jobs_per_second'], 0)
+
+    def test_35(self):
+        before = set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+        with tempfile.TemporaryDirectory() as directory:
+            jobs_path = os.path.join(directory, 'jobs.jsonl')
+            results_path = os.path.join(directory, 'results.jsonl')
+            with open(jobs_path, 'w', encoding='utf-8') as file:
+                file.write(json.dumps({'s': list(range(1, 50)), 'target': 3}) + '\n')
+                file.write('{bad\n')
+                file.write(json.dumps({'target': 3}) + '\n')
+                file.write(json.dumps({'s': [1, 2], 'target': 3}) + '\n')
+            stats = ni1.run_batch(jobs_path, results_path, workers=2, shm_threshold=3)
+            with open(results_path, encoding='utf-8') as file:
+                results = [json.loads(line) for line in file]
+        self.assertEqual(stats['jobs'], 4)
+        self.assertEqual(results[0], {'result': [0, 1]})
+        self.assertTrue(results[1]['error'].startswith(ni1.ERROR_JOB))
+        self.assertTrue(results[2]['error'].startswith(ni1.ERROR_JOB))
+        self.assertEqual(results[3], {'result': [0, 1]})
+        if os.path.isdir('/dev/shm'):
+            self.assertEqual(set(os.listdir('/dev/shm')) - before, set())
+
+
 if __name__ == '__main__':
     unittest.main()